@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 from pathlib import Path
 
@@ -85,21 +86,26 @@ with Session(bind=ENGINE) as session, session.begin():
 with Session(bind=ENGINE) as session, session.begin():
     entry = session.scalars(select(Entry).where(Entry.id == 1)).one()
 
-    print("Entry information:")
-    print(
-        f"\tMeta tags: {[tag.name for tag in entry.category_tags(category=TagCategory.meta_tag)]}"
-    )
-    print(
-        f"\tUser tags: {[tag.name for tag in entry.category_tags(category=TagCategory.user_tag)]}"
-    )
-    print(
-        f"\t\tUser Tags' Subtags: {[(tag.name, [tag.name for tag in tag.subtags]) for tag in entry.category_tags(category=TagCategory.user_tag)]}"
-    )
-    print(f"\tIs archived: {entry.archived}")
-    print(f"\tIs favorited: {entry.archived}")
-    print(
-        f"\tOrdered Fields: \n\t\t{"\n\t\t".join([f"{(i, field.name, field.value)}" for i, field in enumerate(entry.fields)])}"  # type: ignore
-    )
+    meta_tags = entry.category_tags(category=TagCategory.meta_tag)
+    user_tags = entry.category_tags(category=TagCategory.user_tag)
+    lines = [
+        "Entry information:",
+        f"\tMeta tags: {', '.join(tag.name for tag in meta_tags)}",
+        f"\tUser tags: {', '.join(tag.name for tag in user_tags)}",
+        "\t\tUser Tags' Subtags: "
+        + "; ".join(
+            f"{tag.name}: {', '.join(subtag.name for subtag in tag.subtags)}"
+            for tag in user_tags
+        ),
+        f"\tIs archived: {entry.archived}",
+        f"\tIs favorited: {entry.favorited}",
+        "\tOrdered Fields:",
+        *(
+            f"\t\t{(i, field.name, field.value)}"
+            for i, field in enumerate(entry.fields)
+        ),
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print("\nMoving first field to end, reordering, and committing to DB...\n")
 
@@ -113,7 +119,12 @@ with Session(bind=ENGINE) as session, session.begin():
 with Session(bind=ENGINE) as session, session.begin():
     entry = session.scalars(select(Entry).where(Entry.id == 1)).one()
 
-    print("Entry information:")
-    print(
-        f"\tOrdered Fields: \n\t\t{"\n\t\t".join([f"{(i, field.name, field.value)}" for i, field in enumerate(entry.fields)])}"  # type: ignore
-    )
+    lines = [
+        "Entry information:",
+        "\tOrdered Fields:",
+        *(
+            f"\t\t{(i, field.name, field.value)}"
+            for i, field in enumerate(entry.fields)
+        ),
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
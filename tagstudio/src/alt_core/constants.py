@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, NamedTuple
 
 from src.database.table_declarations.field import (
     DatetimeField,
@@ -178,28 +179,33 @@ TAG_COLORS = [
 ]
 
 
-@dataclass
-class DefaultField:
+class DefaultField(NamedTuple):
     name: str
-    class_: Field
+    class_: type[Field]
     type_: FieldType
 
 
-TODO = [
-    {"id": 9, "name": "Collation", "type": "collation"},
-    {"id": 17, "name": "Book", "type": "collation"},
-    {"id": 18, "name": "Comic", "type": "collation"},
-    {"id": 19, "name": "Series", "type": "collation"},
-    {"id": 20, "name": "Manga", "type": "collation"},
-    {"id": 24, "name": "Volume", "type": "collation"},
-    {"id": 25, "name": "Anthology", "type": "collation"},
-    {"id": 26, "name": "Magazine", "type": "collation"},
-    {"id": 15, "name": "Archived", "type": "checkbox"},
-    {"id": 16, "name": "Favorite", "type": "checkbox"},
-]
+class TodoField(NamedTuple):
+    id: int
+    name: str
+    type: str
 
 
-DEFAULT_FIELDS: list[DefaultField] = [
+TODO: tuple[TodoField, ...] = (
+    TodoField(id=9, name="Collation", type="collation"),
+    TodoField(id=17, name="Book", type="collation"),
+    TodoField(id=18, name="Comic", type="collation"),
+    TodoField(id=19, name="Series", type="collation"),
+    TodoField(id=20, name="Manga", type="collation"),
+    TodoField(id=24, name="Volume", type="collation"),
+    TodoField(id=25, name="Anthology", type="collation"),
+    TodoField(id=26, name="Magazine", type="collation"),
+    TodoField(id=15, name="Archived", type="checkbox"),
+    TodoField(id=16, name="Favorite", type="checkbox"),
+)
+
+
+DEFAULT_FIELDS: tuple[DefaultField, ...] = (
     DefaultField(name="Title", class_=TextField, type_=TextFieldTypes.text_line),
     DefaultField(name="Author", class_=TextField, type_=TextFieldTypes.text_line),
     DefaultField(name="Artist", class_=TextField, type_=TextFieldTypes.text_line),
@@ -231,4 +237,22 @@ DEFAULT_FIELDS: list[DefaultField] = [
     DefaultField(
         name="Date Released", class_=DatetimeField, type_=DateTimeTypes.datetime
     ),
-]
+)
+
+TODO_BY_ID: MappingProxyType[int, TodoField] = MappingProxyType(
+    {todo.id: todo for todo in TODO}
+)
+
+DEFAULT_FIELDS_BY_NAME: MappingProxyType[str, DefaultField] = MappingProxyType(
+    {default_field.name: default_field for default_field in DEFAULT_FIELDS}
+)
+
+# INSERT payloads for each of DEFAULT_FIELDS, built once at import.
+# Callers add the "entry_id" and "position" keys.
+DEFAULT_FIELD_ROWS: tuple[dict[str, Any], ...] = tuple(
+    {
+        "name": default_field.name,
+        "value": "" if default_field.class_ is TextField else None,
+    }
+    for default_field in DEFAULT_FIELDS
+)
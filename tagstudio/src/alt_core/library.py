@@ -7,33 +7,47 @@
 import datetime
 import logging
 import os
-import time
 import typing
 from pathlib import Path
 from typing import Iterator, Literal, cast
 from alt_core import constants
 
-from sqlalchemy import and_, select
-from sqlalchemy.orm import Session
-from src.alt_core.constants import DEFAULT_FIELDS
+from sqlalchemy import and_, delete, distinct, exists, func, insert, or_, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+from src.alt_core.constants import DEFAULT_FIELD_ROWS, DEFAULT_FIELDS
 from src.alt_core.types import EntrySearchResult, SearchResult
 from src.core.json_typing import JsonCollation, JsonTag
 from src.database.manage import make_engine, make_tables
-from src.database.queries import path_in_db
 from src.database.table_declarations.entry import Entry
 from src.database.table_declarations.field import (
-    DatetimeField,
     Field,
     TagBoxField,
     TagBoxTypes,
-    TextField,
 )
-from src.database.table_declarations.tag import Tag, TagAlias, TagColor, TagInfo
+from src.database.table_declarations.tag import (
+    Tag,
+    TagAlias,
+    TagCategory,
+    TagColor,
+    TagInfo,
+)
+from src.database.table_declarations.joins import tag_entries, tag_subtags
 from typing_extensions import Self
 
 logging.basicConfig(format="%(message)s", level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
 
+# Statements reused by every bulk insert, built once at import time.
+_INSERT_TAGS = insert(Tag).returning(Tag.id, sort_by_parameter_order=True)
+_INSERT_TAG_ALIASES = insert(TagAlias)
+_INSERT_TAG_SUBTAGS = insert(tag_subtags)
+
+# Folder names that are never scanned for library files.
+IGNORED_DIRS = frozenset({"$RECYCLE.BIN", constants.TS_FOLDER_NAME, "tagstudio_thumbs"})
+# Number of files scanned between progress updates in refresh_dir.
+REFRESH_YIELD_EVERY = 256
+
 
 class Collation:
     """
@@ -66,20 +80,7 @@ class Collation:
     @typing.no_type_check
     def __eq__(self, __value: object) -> bool:
         __value = cast(Self, __value)
-        if os.name == "nt":
-            return (
-                int(self.id) == int(__value.id)
-                and self.filename.lower() == __value.filename.lower()
-                and self.path.lower() == __value.path.lower()
-                and self.fields == __value.fields
-            )
-        else:
-            return (
-                int(self.id) == int(__value.id)
-                and self.filename == __value.filename
-                and self.path == __value.path
-                and self.fields == __value.fields
-            )
+        return self.id == __value.id and self.fields == __value.fields
 
     def compressed_dict(self) -> JsonCollation:
         """
@@ -101,25 +102,31 @@ class Collation:
         return obj
 
 
-def library_defaults() -> list[Tag]:
-    archive_tag = Tag(
-        name="Archived",
-        aliases=set([TagAlias(name="Archive")]),
-        color=TagColor.red,
-    )
+# (name, aliases, color) of the built-in Tags every new library starts with.
+_DEFAULT_TAG_SPECS: tuple[tuple[str, tuple[str, ...], TagColor], ...] = (
+    ("Archived", ("Archive",), TagColor.red),
+    ("Favorite", ("Favorited", "Favorites"), TagColor.yellow),
+)
 
-    favorite_tag = Tag(
-        name="Favorite",
-        aliases=set(
-            [
-                TagAlias(name="Favorited"),
-                TagAlias(name="Favorites"),
-            ]
-        ),
-        color=TagColor.yellow,
-    )
 
-    return [archive_tag, favorite_tag]
+def add_library_defaults(session: Session) -> None:
+    """Bulk inserts the built-in Tags and their aliases."""
+    tag_ids = session.scalars(
+        _INSERT_TAGS,
+        [
+            {"name": name, "category": TagCategory.user_tag, "color": color}
+            for name, _, color in _DEFAULT_TAG_SPECS
+        ],
+    ).all()
+
+    session.execute(
+        _INSERT_TAG_ALIASES,
+        [
+            {"name": alias, "tag_id": tag_id}
+            for tag_id, (_, aliases, _) in zip(tag_ids, _DEFAULT_TAG_SPECS)
+            for alias in aliases
+        ],
+    )
 
 
 class Library:
@@ -132,14 +139,37 @@ class Library:
     @property
     def entries(self) -> list[Entry]:
         with Session(self.engine) as session, session.begin():
-            entries = list(session.scalars(select(Entry)).all())
+            # Tags are read by Entry.favorited/archived after the Entries
+            # are detached, so they must be loaded up front.
+            entries = list(self.iter_entries(session, selectinload(Entry.tags)))
             session.expunge_all()
         return entries
 
+    def iter_entries(
+        self, session: Session, *options: ExecutableOption
+    ) -> Iterator[Entry]:
+        """
+        Streams every Entry from the given session in chunks of 1000 rows.
+        Loader options (e.g. `selectinload`) are applied once per chunk.
+        """
+        yield from session.scalars(
+            select(Entry)
+            .options(*options)
+            .execution_options(stream_results=True, yield_per=1000)
+        )
+
     @property
     def tags(self) -> list[Tag]:
         with Session(self.engine) as session, session.begin():
-            tags = list(session.scalars(select(Tag)).all())
+            tags = list(
+                session.scalars(
+                    select(Tag).options(
+                        selectinload(Tag.subtags),
+                        selectinload(Tag.parent_tags),
+                        selectinload(Tag.aliases),
+                    )
+                ).all()
+            )
             session.expunge_all()
         return tags
 
@@ -173,8 +203,8 @@ class Library:
         self.missing_files: list[str] = []
         self.dupe_files: list[tuple[str, str, int]] = []
         self.filename_to_entry_id_map: dict[str, int] = {}
-        self.default_ext_blacklist: list[str] = ["json", "xmp", "aae"]
-        self.ignored_extensions: list[str] = self.default_ext_blacklist
+        self.default_ext_blacklist: tuple[str, ...] = ("json", "xmp", "aae")
+        self.ignored_extensions: frozenset[str] = frozenset(self.default_ext_blacklist)
 
     def create_library(self, path: str | Path) -> bool:
         """Creates an SQLite DB at path.
@@ -198,15 +228,19 @@ class Library:
             self.root_path = path
             self.verify_ts_folders()
 
-            connection_string = (
-                f"sqlite:///{path / constants.TS_FOLDER_NAME / constants.LIBRARY_FILENAME}"
-            )
+            connection_string = f"sqlite:///{path / constants.TS_FOLDER_NAME / constants.LIBRARY_FILENAME}"
             self.engine = make_engine(connection_string=connection_string)
-            make_tables(engine=self.engine)
 
-            session = Session(self.engine)
-            with session.begin():
-                session.add_all(library_defaults())
+            # Create the schema and seed it in a single transaction.
+            with self.engine.begin() as connection:
+                make_tables(engine=connection)
+                with Session(
+                    bind=connection, join_transaction_mode="create_savepoint"
+                ) as session:
+                    add_library_defaults(session)
+                    # Releases the savepoint; closing the Session without
+                    # committing would roll the defaults back.
+                    session.commit()
 
         except Exception as e:
             LOGGER.exception(e)
@@ -278,64 +312,106 @@ class Library:
         self.files_not_in_library.clear()
         self.missing_files.clear()
         self.filename_to_entry_id_map = {}
-        self.ignored_extensions = self.default_ext_blacklist
+        self.ignored_extensions = frozenset(self.default_ext_blacklist)
 
     def refresh_dir(self) -> Iterator[int]:
-        """Scans a directory for files, and adds those relative filenames to internal variables."""
+        """
+        Scans a directory for files, and adds those relative filenames to internal variables.
+        Entries whose files weren't found are recorded in `missing_files` by the same
+        walk, so `refresh_missing_files` doesn't need to be run afterwards.
+        """
 
         if self.root_path is None:
             raise ValueError("No library path set.")
 
         self.dir_file_count = 0
+        # Reset now, so results from an earlier scan are never mixed in if this
+        # one is stopped early.
+        self.missing_files = []
+
+        with Session(self.engine) as session, session.begin():
+            # Check paths against an in-memory set rather than querying per file.
+            existing_paths: set[Path] = set(session.scalars(select(Entry.path)))
+        missing_paths: set[Path] = set(existing_paths)
+        pending_entries: list[Entry] = []
 
         # Scans the directory for files, keeping track of:
         #   - Total file count
-        start_time = time.time()
-        for path in self.root_path.glob("**/*"):
-            str_path = str(path)
-            if (
-                not path.is_dir()
-                and "$RECYCLE.BIN" not in str_path
-                and constants.TS_FOLDER_NAME not in str_path
-                and "tagstudio_thumbs" not in str_path
-            ):
-                suffix = path.suffix.lower()
-                if suffix != "" and suffix[0] == ".":
-                    suffix = suffix[1:]
+        #   - Entries without files
+        for dir_path, dir_names, file_names in os.walk(self.root_path):
+            # Prune ignored folders in place so their contents are never walked.
+            dir_names[:] = [d for d in dir_names if d not in IGNORED_DIRS]
+            relative_dir = Path(dir_path).relative_to(self.root_path)
 
-                if suffix not in self.ignored_extensions:
-                    self.dir_file_count += 1
+            for file_name in file_names:
+                relative_path = relative_dir / file_name
+                missing_paths.discard(relative_path)
 
-                    relative_path = path.relative_to(self.root_path)
-                    if not path_in_db(path=relative_path, engine=self.engine):
-                        self.add_entry_to_library(entry=Entry(path=relative_path))
+                suffix = os.path.splitext(file_name)[1][1:].lower()
 
-            end_time = time.time()
-            # Yield output every 1/30 of a second
-            if (end_time - start_time) > 0.034:
-                yield self.dir_file_count
-                start_time = time.time()
+                if suffix not in self.ignored_extensions:
+                    self.dir_file_count += 1
+                    # Yield progress every few hundred files rather than
+                    # checking the clock on every iteration.
+                    if self.dir_file_count % REFRESH_YIELD_EVERY == 0:
+                        yield self.dir_file_count
+
+                    if relative_path not in existing_paths:
+                        existing_paths.add(relative_path)
+                        pending_entries.append(Entry(path=relative_path))
+
+                        # Commit each batch, so the write lock isn't held
+                        # across yields and stopping early keeps what was added.
+                        if len(pending_entries) >= 1000:
+                            self._add_entries(pending_entries)
+                            pending_entries.clear()
+
+        self._add_entries(pending_entries)
+
+        self.missing_files = [str(self.root_path / path) for path in missing_paths]
+        # Always report the final count, including for libraries too small
+        # to reach a progress update.
+        yield self.dir_file_count
+
+    def _add_entries(self, entries: list[Entry]) -> None:
+        """Adds new Entries to the Library in their own transaction."""
+        with Session(self.engine) as session, session.begin():
+            session.add_all(entries)
 
     def refresh_missing_files(self) -> Iterator[int]:
         """Tracks the number of Entries that point to an invalid file path."""
-        self.missing_files.clear()
+        self.missing_files = []
 
         if self.root_path is None:
             raise ValueError("No library path set.")
 
-        for i, entry in enumerate(self.entries):
-            full_path = self.root_path / entry.path
-            if not full_path.exists() or not full_path.is_file():
-                self.missing_files.append(str(full_path))
-            yield i
+        # Index the files on disk with one walk instead of stat-ing every Entry.
+        present_paths: set[Path] = set()
+        for dir_path, dir_names, file_names in os.walk(self.root_path):
+            dir_names[:] = [d for d in dir_names if d not in IGNORED_DIRS]
+            relative_dir = Path(dir_path).relative_to(self.root_path)
+            present_paths.update(relative_dir / file_name for file_name in file_names)
+
+        with Session(self.engine) as session, session.begin():
+            paths = session.scalars(
+                select(Entry.path).execution_options(yield_per=1000)
+            )
+            # Collect into a local list, so another scan started before this one
+            # finishes can't have its results appended to.
+            missing_files: list[str] = []
+            for i, path in enumerate(paths):
+                if path not in present_paths:
+                    missing_files.append(str(self.root_path / path))
+                yield i
+        self.missing_files = missing_files
 
     def remove_entry(self, entry_id: int) -> None:
         """Removes an Entry from the Library."""
 
         with Session(self.engine) as session, session.begin():
-            entry = session.scalar(select(Entry).where(Entry.id == entry_id))
+            entry = session.get(Entry, entry_id)
             if entry is None:
-                raise ValueError("")
+                raise ValueError(f"Entry with id {entry_id} not found.")
             session.delete(entry)
 
     # TODO
@@ -414,11 +490,11 @@ class Library:
     def get_entry(self, entry_id: int) -> Entry:
         """Returns an Entry object given an Entry ID."""
         with Session(self.engine) as session, session.begin():
-            entry = session.scalar(select(Entry).where(Entry.id == entry_id))
-            session.expunge(entry)
+            entry = session.get(Entry, entry_id)
+            if entry is None:
+                raise ValueError(f"Entry with id {entry_id} not found.")
 
-        if entry is None:
-            raise ValueError(f"Entry with id {entry_id} not found.")
+            session.expunge(entry)
 
         return entry
 
@@ -426,14 +502,16 @@ class Library:
         """Returns an Entry object given an Entry ID."""
         with Session(self.engine) as session, session.begin():
             entry = session.scalars(
-                select(Entry).where(Entry.id == entry_id).limit(1)
+                select(Entry)
+                .where(Entry.id == entry_id)
+                .limit(1)
+                .options(
+                    selectinload(Entry.fields),
+                    selectinload(Entry.tags).selectinload(Tag.subtags),
+                    selectinload(Entry.tags).selectinload(Tag.aliases),
+                )
             ).one()
 
-            _ = entry.fields
-            for tag in entry.tags:
-                tag.subtags
-                tag.alias_strings
-
             session.expunge_all()
 
         return entry
@@ -474,6 +552,12 @@ class Library:
                 else:
                     statement = statement.where(Entry.path.like(f"%{query}%"))
 
+            # Stream the rows in chunks; each chunk's tags (needed for the
+            # favorited/archived flags) are loaded by a single follow-up query.
+            statement = statement.options(selectinload(Entry.tags)).execution_options(
+                yield_per=1000
+            )
+
             entries_ = session.scalars(statement)
 
             for entry in entries_:
@@ -504,19 +588,23 @@ class Library:
     def get_all_child_tag_ids(self, tag_id: int) -> list[int]:
         """Recursively traverse a Tag's subtags and return a list of all children tags."""
 
-        all_subtags: set[int] = set([tag_id])
-
         with Session(self.engine) as session, session.begin():
-            tag = session.scalar(select(Tag).where(Tag.id == tag_id))
-            if tag is None:
+            if session.get(Tag, tag_id) is None:
                 raise ValueError(f"No tag found with id {tag_id}.")
 
-            subtag_ids = tag.subtag_ids
-
-        all_subtags.update(subtag_ids)
+            subtag_map: dict[int, list[int]] = {}
+            for parent_id, subtag_id in session.execute(
+                select(tag_subtags.c.parent_tag_id, tag_subtags.c.subtag_id)
+            ):
+                subtag_map.setdefault(parent_id, []).append(subtag_id)
 
-        for sub_id in subtag_ids:
-            all_subtags.update(self.get_all_child_tag_ids(sub_id))
+        all_subtags: set[int] = {tag_id}
+        stack = [tag_id]
+        while stack:
+            for sub_id in subtag_map.get(stack.pop(), []):
+                if sub_id not in all_subtags:
+                    all_subtags.add(sub_id)
+                    stack.append(sub_id)
 
         return list(all_subtags)
 
@@ -550,9 +638,7 @@ class Library:
             for old_alias in tag_to_update.aliases:
                 session.delete(old_alias)
 
-            tag_to_update.aliases = set(
-                [TagAlias(name=name) for name in tag_info.aliases]
-            )
+            tag_to_update.aliases = {TagAlias(name=name) for name in tag_info.aliases}
 
             subtags = session.scalars(
                 select(Tag).where(Tag.id.in_(tag_info.subtag_ids))
@@ -575,26 +661,51 @@ class Library:
     def remove_tag(self, tag_id: int) -> None:
         """
         Removes a Tag from the Library.
-        Disconnects it from all internal lists and maps, then remaps others as needed.
+        Disconnects it from all Entries, parent Tags, and subtags.
         """
-        pass
+        with Session(self.engine) as session, session.begin():
+            session.execute(delete(tag_entries).where(tag_entries.c.tag_id == tag_id))
+            session.execute(
+                delete(tag_subtags).where(
+                    or_(
+                        tag_subtags.c.parent_tag_id == tag_id,
+                        tag_subtags.c.subtag_id == tag_id,
+                    )
+                )
+            )
+            session.execute(delete(TagAlias).where(TagAlias.tag_id == tag_id))
+            session.execute(delete(Tag).where(Tag.id == tag_id))
+
+    def get_tag_ref_count(self, tag_id: int) -> tuple[int, int]:
+        """Returns an int tuple (entry_ref_count, subtag_ref_count) of Tag reference counts."""
+        with Session(self.engine) as session, session.begin():
+            entry_ref_count = session.scalar(
+                select(func.count(distinct(tag_entries.c.entry_id))).where(
+                    tag_entries.c.tag_id == tag_id
+                )
+            )
+            subtag_ref_count = session.scalar(
+                select(func.count(distinct(tag_subtags.c.parent_tag_id))).where(
+                    tag_subtags.c.subtag_id == tag_id
+                )
+            )
+
+        return (entry_ref_count or 0, subtag_ref_count or 0)
 
     def update_entry_path(self, entry: int | Entry, path: str) -> None:
         if isinstance(entry, Entry):
             entry = entry.id
 
         with Session(self.engine) as session, session.begin():
-            entry_object = session.scalars(select(Entry).where(Entry.id == entry)).one()
+            entry_object = session.get_one(Entry, entry)
 
             entry_object.path = Path(path)
 
     def remove_tag_from_field(self, tag: Tag, field: TagBoxField) -> None:
         with Session(self.engine) as session, session.begin():
-            field_ = session.scalars(
-                select(TagBoxField).where(TagBoxField.id == field.id)
-            ).one()
+            field_ = session.get_one(TagBoxField, field.id)
 
-            tag = session.scalars(select(Tag).where(Tag.id == tag.id)).one()
+            tag = session.get_one(Tag, tag.id)
 
             field_.tags.remove(tag)
 
@@ -639,26 +750,45 @@ class Library:
                     raise NotImplementedError
 
     def add_field_to_entry(self, entry_id: int, field_id: int) -> None:
+        default_field = DEFAULT_FIELDS[field_id]
+
         with Session(self.engine) as session, session.begin():
-            entry = session.scalars(select(Entry).where(Entry.id == entry_id)).one()
+            position = session.scalar(
+                select(func.count(Field.id)).where(Field.entry_id == entry_id)
+            )
 
-            default_field = DEFAULT_FIELDS[field_id]
-            if default_field.class_ == TextField:
-                entry.text_fields.append(
-                    TextField(
-                        name=default_field.name, type=default_field.type_, value=""
+            session.execute(
+                insert(default_field.class_),
+                [
+                    {
+                        **DEFAULT_FIELD_ROWS[field_id],
+                        "entry_id": entry_id,
+                        "position": position,
+                    }
+                ],
+            )
+
+    def does_field_content_exist(
+        self, entry_id: int, field_id: int, content: str | datetime.datetime
+    ) -> bool:
+        """Returns whether or not content exists in a specific entry field type."""
+        default_field = DEFAULT_FIELDS[field_id]
+        field_class = default_field.class_
+
+        with Session(self.engine) as session:
+            return bool(
+                session.scalar(
+                    select(
+                        exists().where(
+                            and_(
+                                field_class.entry_id == entry_id,
+                                field_class.name == default_field.name,
+                                field_class.value == content,
+                            )
+                        )
                     )
                 )
-            elif default_field.class_ == TagBoxField:
-                entry.tag_box_fields.append(
-                    TagBoxField(name=default_field.name, type=default_field.type_)
-                )
-            elif default_field.class_ == DatetimeField:
-                entry.datetime_fields.append(
-                    DatetimeField(name=default_field.name, type=default_field.type_)
-                )
-            else:
-                raise ValueError("Unknown field.")
+            )
 
     def get_field_from_stale(self, stale_field: Field, session: Session) -> Field:
         return session.scalars(
@@ -669,28 +799,35 @@ class Library:
 
     def create_tag(self, tag_info: TagInfo) -> None:
         with Session(self.engine) as session, session.begin():
-            subtags = set(
-                session.scalars(
-                    select(Tag).where(Tag.id.in_(tag_info.subtag_ids))
-                ).all()
-            )
-            parent_tags = set(
-                session.scalars(
-                    select(Tag).where(Tag.id.in_(tag_info.parent_tag_ids))
-                ).all()
-            )
+            tag_id = session.scalars(
+                _INSERT_TAGS,
+                [
+                    {
+                        "name": tag_info.name,
+                        "category": TagCategory.user_tag,
+                        "shorthand": tag_info.shorthand,
+                        "color": tag_info.color,
+                        "icon": tag_info.icon,
+                    }
+                ],
+            ).one()
 
-            session.add(
-                Tag(
-                    name=tag_info.name,
-                    shorthand=tag_info.shorthand,
-                    aliases=set([TagAlias(name=name) for name in tag_info.aliases]),
-                    parent_tags=parent_tags,
-                    subtags=subtags,
-                    color=tag_info.color,
-                    icon=tag_info.icon,
+            if tag_info.aliases:
+                session.execute(
+                    _INSERT_TAG_ALIASES,
+                    [{"name": name, "tag_id": tag_id} for name in tag_info.aliases],
                 )
-            )
+
+            # Wire up the hierarchy by primary key rather than loading Tags.
+            subtag_rows = [
+                {"parent_tag_id": tag_id, "subtag_id": subtag_id}
+                for subtag_id in tag_info.subtag_ids
+            ] + [
+                {"parent_tag_id": parent_tag_id, "subtag_id": tag_id}
+                for parent_tag_id in tag_info.parent_tag_ids
+            ]
+            if subtag_rows:
+                session.execute(_INSERT_TAG_SUBTAGS, subtag_rows)
 
     def get_tag(
         self,
@@ -702,18 +839,19 @@ class Library:
         if isinstance(tag, Tag):
             tag = tag.id
 
-        with Session(self.engine) as session, session.begin():
-            tag_object = session.scalars(select(Tag).where(Tag.id == tag)).one()
+        statement = select(Tag).where(Tag.id == tag)
+
+        if with_subtags:
+            statement = statement.options(selectinload(Tag.subtags))
 
-            if with_subtags:
-                _ = tag_object.subtags
+        if with_parents:
+            statement = statement.options(selectinload(Tag.parent_tags))
 
-            if with_parents:
-                _ = tag_object.parent_tags
+        if with_aliases:
+            statement = statement.options(selectinload(Tag.aliases))
 
-            if with_aliases:
-                _ = tag_object.aliases
-                _ = tag_object.alias_strings
+        with Session(self.engine) as session, session.begin():
+            tag_object = session.scalars(statement).one()
 
             session.expunge(tag_object)
 
@@ -727,7 +865,7 @@ class Library:
             tag = tag.id
 
         with Session(self.engine) as session, session.begin():
-            tag_object = session.scalars(select(Tag).where(Tag.id == tag)).one()
+            tag_object = session.get_one(Tag, tag)
 
             return tag_object.display_name
 
@@ -740,11 +878,9 @@ class Library:
             tag = tag.id
 
         with Session(self.engine) as session, session.begin():
-            tag_object = session.scalars(select(Tag).where(Tag.id == tag)).one()
+            tag_object = session.get_one(Tag, tag)
 
-            field_ = session.scalars(
-                select(TagBoxField).where(TagBoxField.id == field.id)
-            ).one()
+            field_ = session.get_one(TagBoxField, field.id)
 
             field_.tags.add(tag_object)
 
@@ -761,7 +897,7 @@ class Library:
                     )
                 )
             ).one()
-            tag = session.scalars(select(Tag).where(Tag.id == tag)).one()
+            tag = session.get_one(Tag, tag)
 
             meta_tag_box.tags.add(tag)
 
@@ -778,7 +914,7 @@ class Library:
                     )
                 )
             ).one()
-            tag = session.scalars(select(Tag).where(Tag.id == tag)).one()
+            tag = session.get_one(Tag, tag)
 
             meta_tag_box.tags.remove(tag)
 
@@ -790,6 +926,6 @@ class Library:
         if isinstance(entry, Entry):
             entry = entry.id
         with Session(self.engine) as session, session.begin():
-            entry_ = session.scalars(select(Entry).where(Entry.id == entry)).one()
+            entry_ = session.get_one(Entry, entry)
 
             return (entry_.archived, entry_.favorited)
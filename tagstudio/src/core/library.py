@@ -4,9 +4,14 @@
 
 """The Library object and related methods for TagStudio."""
 
+import array
+import bisect
 import datetime
+import functools
+import itertools
 import logging
 import os
+import threading
 import time
 import traceback
 import xml.etree.ElementTree as ET
@@ -30,6 +35,40 @@ from src.core.constants import (
 )
 
 TYPE = ["file", "meta", "alt", "mask"]
+# Maximum number of memoized search_tags() results kept per Library.
+SEARCH_TAGS_CACHE_SIZE = 4096
+# TODO: Replace this and any in CLI with a proper user-defined
+# field storing method.
+# Field ID -> position of that field when mirroring Entry fields.
+MIRRORED_FIELD_RANK: dict[int, int] = {
+    field_id: i
+    for i, field_id in enumerate(
+        [0]
+        + [1, 2]
+        + [9, 17, 18, 19, 20]
+        + [10, 14, 11, 12, 13, 22]
+        + [4, 5]
+        + [8, 7, 6]
+        + [3, 21]
+    )
+}
+# Folder names that are never scanned for library files.
+IGNORED_DIRS = frozenset({"$RECYCLE.BIN", TS_FOLDER_NAME, "tagstudio_thumbs"})
+# Number of files scanned between progress updates in refresh_dir.
+REFRESH_YIELD_EVERY = 256
+# Entry IDs are kept in a dense array while its span stays within this many
+# slots per Entry. IDs that would stretch it further are kept in a dict.
+ENTRY_ID_MAP_MAX_SPARSENESS = 4
+# Array slots always allowed before ENTRY_ID_MAP_MAX_SPARSENESS applies.
+ENTRY_ID_MAP_MIN_SLOTS = 1024
+# Maximum number of distinct Tag strings kept by _normalize_tag_string().
+NORMALIZED_TAG_STRINGS_CACHE_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=NORMALIZED_TAG_STRINGS_CACHE_SIZE)
+def _normalize_tag_string(string: str) -> str:
+    """Returns a Tag name, shorthand, or alias as used for Tag string map keys."""
+    return strip_punctuation(string).lower()
 
 
 # RESULT_TYPE = Enum('Result', ['ENTRY', 'COLLATION', 'TAG_GROUP'])
@@ -312,7 +351,12 @@ class Library:
         self.entries: list[Entry] = []
         self._next_entry_id: int = 0
         # Map of every Entry ID to the index of the Entry in self.entries.
-        self._entry_id_to_index_map: dict[int, int] = {}
+        #   Entry IDs are usually dense, so this is an array indexed by
+        #   (ID - _entry_id_base), with -1 marking an unused ID. Negative or
+        #   outlying IDs go in _sparse_entry_id_to_index_map instead.
+        self._entry_id_to_index_map: array.array = array.array("q")
+        self._entry_id_base: int = 0
+        self._sparse_entry_id_to_index_map: dict[int, int] = {}
         # # List of filtered Entry indexes generated by the filter_entries() method.
         # self.filtered_entries: list[int] = []
         # Duplicate Entries
@@ -355,16 +399,29 @@ class Library:
         #   Used for O(1) lookup of Tag IDs based on search terms.
         #   NOTE: While it is recommended to keep Tag aliases unique to each Tag,
         #   there may be circumstances where this is not possible or elegant.
-        #   Because of this, names and aliases are mapped to a list of IDs rather than a
+        #   Because of this, names and aliases are mapped to a tuple of IDs rather than a
         #   singular ID to handle potential alias collision.
-        self._tag_strings_to_id_map: dict[str, list[int]] = {}
+        self._tag_strings_to_id_map: dict[str, tuple[int, ...]] = {}
+        # The keys of _tag_strings_to_id_map in sorted order, and the position of each
+        # key in the map, used to find the strings starting with a search query.
+        #   Rebuilt on the next search after the map changes.
+        self._sorted_tag_strings: list[str] | None = None
+        self._tag_string_positions: dict[str, int] = {}
         # Map of every Tag ID to an array of Tag IDs that make up the Tag's "cluster", aka a list
         # of references from other Tags that specify this Tag as one of its subtags.
         #   This in effect is like a reverse subtag map.
         #   Used for O(1) lookup of the Tags to return in a query given a Tag ID.
-        self._tag_id_to_cluster_map: dict[int, list[int]] = {}
+        # Each cluster is an insertion-ordered dict used as an ordered set,
+        # giving O(1) membership checks while keeping the mapping order.
+        self._tag_id_to_cluster_map: dict[int, dict[int, None]] = {}
         # Map of every Tag ID to the index of the Tag in self.tags.
         self._tag_id_to_index_map: dict[int, int] = {}
+        # Memoized search_tags() results, keyed by the search arguments.
+        #   Cleared whenever the Tag string or cluster maps change.
+        self._search_tags_cache: dict[tuple, tuple[int, ...]] = {}
+        # Held while searching Tags and while changing the Tags or their maps,
+        #   as search_tags() is also called from worker threads.
+        self._tag_lock = threading.RLock()
 
         self.default_tags: list[JsonTag] = [
             {"id": 0, "name": "Archived", "aliases": ["Archive"], "color": "Red"},
@@ -540,17 +597,20 @@ class Library:
                                 # That method is only used for Tags added at runtime.
                                 # This process uses the same inner methods, but waits until all of the
                                 # Tags are registered in the Tags list before creating the Tag clusters.
+                                self._map_tag_id_to_index(t, len(self.tags))
                                 self.tags.append(t)
-                                self._map_tag_id_to_index(t, -1)
-                                self._map_tag_strings_to_tag_id(t)
                             else:
                                 logging.info(
                                     f"[LIBRARY]Skipping Tag with duplicate ID: {tag}"
                                 )
 
-                        # Step 3: Map each Tag's subtags together now that all Tag objects in it.
-                        for t in self.tags:
-                            self._map_tag_id_to_cluster(t)
+                        with self._tag_lock:
+                            # Step 3: Map every Tag's strings to its ID in one pass.
+                            self._map_all_tag_strings_to_tag_ids()
+
+                            # Step 4: Map each Tag's subtags together now that all Tag objects in it.
+                            for t in self.tags:
+                                self._map_tag_id_to_cluster(t)
 
                         end_time = time.time()
                         logging.info(
@@ -577,8 +637,8 @@ class Library:
                                 # Cast JSON str keys to ints
 
                                 for f in entry["fields"]:
-                                    f[int(list(f.keys())[0])] = f[list(f.keys())[0]]
-                                    del f[list(f.keys())[0]]
+                                    key, content = f.popitem()
+                                    f[int(key)] = content
                                 fields = entry["fields"]
 
                             # Look through fields for legacy Collation data --------
@@ -634,8 +694,10 @@ class Library:
                                                     ),
                                                 )
                                             )
+                                            self._map_collation_id_to_index(
+                                                c, len(self.collations)
+                                            )
                                             self.collations.append(c)
-                                            self._map_collation_id_to_index(c, -1)
                                         f_id = self.get_field_attr(f, "id")
                                         f.clear()
                                         f[int(f_id)] = collation_id
@@ -650,8 +712,8 @@ class Library:
                                 path=e_path,
                                 fields=fields,
                             )
+                            self._map_entry_id_to_index(e, len(self.entries))
                             self.entries.append(e)
-                            self._map_entry_id_to_index(e, -1)
 
                         end_time = time.time()
                         logging.info(
@@ -687,8 +749,8 @@ class Library:
                             # which is intended to be used at runtime. However, there is
                             # currently no reason why it couldn't be used here, and is
                             # instead not used for consistency.
+                            self._map_collation_id_to_index(c, len(self.collations))
                             self.collations.append(c)
-                            self._map_collation_id_to_index(c, -1)
                         end_time = time.time()
                         logging.info(
                             f"[LIBRARY] Collations loaded in {(end_time - start_time):.3f} seconds"
@@ -824,7 +886,7 @@ class Library:
         self.entries.clear()
         self._next_entry_id = 0
         # self.filtered_entries.clear()
-        self._entry_id_to_index_map.clear()
+        self._clear_entry_id_to_index_map()
 
         self._collation_id_to_index_map.clear()
 
@@ -836,11 +898,14 @@ class Library:
         self.filename_to_entry_id_map: dict[Path, int] = {}
         self.ignored_extensions = self.default_ext_blacklist
 
-        self.tags.clear()
-        self._next_tag_id = 1000
-        self._tag_strings_to_id_map = {}
-        self._tag_id_to_cluster_map = {}
-        self._tag_id_to_index_map = {}
+        with self._tag_lock:
+            self.tags.clear()
+            self._next_tag_id = 1000
+            self._tag_strings_to_id_map = {}
+            self._sorted_tag_strings = None
+            self._tag_id_to_cluster_map = {}
+            self._tag_id_to_index_map = {}
+            self._search_tags_cache.clear()
         self._tag_entry_ref_map.clear()
 
     def refresh_dir(self) -> Generator:
@@ -855,32 +920,32 @@ class Library:
         #   - Total file count
         #   - Files without library entries
         # for type in TYPES:
-        start_time = time.time()
-        for f in self.library_dir.glob("**/*"):
-            try:
-                if (
-                    "$RECYCLE.BIN" not in f.parts
-                    and TS_FOLDER_NAME not in f.parts
-                    and "tagstudio_thumbs" not in f.parts
-                    and not f.is_dir()
-                ):
-                    if f.suffix not in self.ignored_extensions:
-                        self.dir_file_count += 1
-                        file = f.relative_to(self.library_dir)
-                        try:
-                            _ = self.filename_to_entry_id_map[file]
-                        except KeyError:
-                            # print(file)
-                            self.files_not_in_library.append(file)
-            except PermissionError:
+        def log_walk_error(error: OSError) -> None:
+            if isinstance(error, PermissionError):
                 logging.info(
-                    f"The File/Folder {f} cannot be accessed, because it requires higher permission!"
+                    f"The File/Folder {error.filename} cannot be accessed, because it requires higher permission!"
                 )
-            end_time = time.time()
-            # Yield output every 1/30 of a second
-            if (end_time - start_time) > 0.034:
-                yield self.dir_file_count
-                start_time = time.time()
+
+        for dir_path, dir_names, file_names in os.walk(
+            self.library_dir, onerror=log_walk_error
+        ):
+            # Prune ignored folders in place so their contents are never walked.
+            dir_names[:] = [d for d in dir_names if d not in IGNORED_DIRS]
+            relative_dir = Path(dir_path).relative_to(self.library_dir)
+
+            for file_name in file_names:
+                if os.path.splitext(file_name)[1] not in self.ignored_extensions:
+                    self.dir_file_count += 1
+                    file = relative_dir / file_name
+                    if file not in self.filename_to_entry_id_map:
+                        self.files_not_in_library.append(file)
+                    # Yield progress every few hundred files rather than
+                    # checking the clock on every iteration.
+                    if self.dir_file_count % REFRESH_YIELD_EVERY == 0:
+                        yield self.dir_file_count
+        # Always report the final count, including for libraries too small
+        # to reach a progress update.
+        yield self.dir_file_count
         # Sorts the files by date modified, descending.
         if len(self.files_not_in_library) <= 100000:
             try:
@@ -920,15 +985,16 @@ class Library:
 
         del self.filename_to_entry_id_map[path]
 
-        del self.entries[self._entry_id_to_index_map[entry_id]]
+        removed_index: int = self._get_entry_index(entry_id)
+        self._unmap_entry_id(entry_id)
+        del self.entries[removed_index]
 
         # self.entries.remove(self.entries[self._entry_id_to_index_map[entry_id]])
 
         # Step [2/2]:
-        # Remap the other Entry IDs to their new indices in the Entries list.
-        self._entry_id_to_index_map.clear()
-        for i, e in enumerate(self.entries):
-            self._map_entry_id_to_index(e, i)
+        # Remap only the Entry IDs that came after it to their new indices.
+        for i in range(removed_index, len(self.entries)):
+            self._map_entry_id_to_index(self.entries[i], i)
 
         # # Step [3/3]:
         # # Remap filenames to new indices.
@@ -980,33 +1046,28 @@ class Library:
         """
 
         logging.info("[LIBRARY] Mirroring Duplicate Entries...")
-        id_to_entry_map: dict = {}
-
         for dupe in self.dupe_entries:
-            # Store the id to entry relationship as the library one is about to
-            # be destroyed.
-            # NOTE: This is not a good solution, but will be upended by the
-            # database migration soon anyways.
-            for id in dupe[1]:
-                id_to_entry_map[id] = self.get_entry(id)
             self.mirror_entry_fields([dupe[0]] + dupe[1])
 
         logging.info(
             "[LIBRARY] Consolidating Entries... (This may take a while for larger libraries)"
         )
+        # NOTE: Instead of using self.remove_entry(id), I'm bypassing it
+        # because it's currently inefficient in how it needs to remap
+        # every ID to every list index. I'm recreating the steps it
+        # takes but in a batch-friendly way here.
+        removed_ids: set[int] = set()
         for i, dupe in enumerate(self.dupe_entries):
             for id in dupe[1]:
-                # NOTE: Instead of using self.remove_entry(id), I'm bypassing it
-                # because it's currently inefficient in how it needs to remap
-                # every ID to every list index. I'm recreating the steps it
-                # takes but in a batch-friendly way here.
-                # NOTE: Couldn't use get_entry(id) because that relies on the
-                # entry's index in the list, which is currently being messed up.
                 logging.info(f"[LIBRARY] Removing Unneeded Entry {id}")
-                self.entries.remove(id_to_entry_map[id])
+                removed_ids.add(id)
             yield i - 1  # The -1 waits for the next step to finish
 
-        self._entry_id_to_index_map.clear()
+        # Drop every unneeded Entry in one pass rather than one list.remove()
+        # (a linear scan comparing Entries) per duplicate.
+        self.entries = [e for e in self.entries if e.id not in removed_ids]
+
+        self._clear_entry_id_to_index_map()
         for i, e in enumerate(self.entries, start=0):
             self._map_entry_id_to_index(e, i)
         self._map_filenames_to_entry_ids()
@@ -1243,8 +1304,8 @@ class Library:
 
     def add_entry_to_library(self, entry: Entry):
         """Adds a new Entry to the Library."""
+        self._map_entry_id_to_index(entry, len(self.entries))
         self.entries.append(entry)
-        self._map_entry_id_to_index(entry, -1)
 
     def add_new_files_as_entries(self) -> list[int]:
         """Adds files from the `files_not_in_library` list to the Library as Entries. Returns list of added indices."""
@@ -1266,7 +1327,7 @@ class Library:
 
     def get_entry(self, entry_id: int) -> Entry:
         """Returns an Entry object given an Entry ID."""
-        return self.entries[self._entry_id_to_index_map[int(entry_id)]]
+        return self.entries[self._get_entry_index(entry_id)]
 
     def get_collation(self, collation_id: int) -> Collation:
         """Returns a Collation object given an Collation ID."""
@@ -1542,8 +1603,41 @@ class Library:
         ignore_builtin=False,
         threshold: int = 1,
         context: list[str] = None,
+        limit: int | None = None,
+    ) -> list[int]:
+        """
+        Returns a list of Tag IDs returned from a string query.
+        If a limit is given, only the first limit Tag IDs are returned.
+        """
+        key = (
+            query,
+            include_cluster,
+            ignore_builtin,
+            threshold,
+            tuple(context) if context else None,
+        )
+        with self._tag_lock:
+            tag_ids = self._search_tags_cache.get(key)
+            if tag_ids is None:
+                if len(self._search_tags_cache) >= SEARCH_TAGS_CACHE_SIZE:
+                    self._search_tags_cache.clear()
+                tag_ids = tuple(
+                    self._search_tags(
+                        query, include_cluster, ignore_builtin, threshold, context
+                    )
+                )
+                self._search_tags_cache[key] = tag_ids
+        return list(tag_ids[:limit])
+
+    def _search_tags(
+        self,
+        query: str,
+        include_cluster=False,
+        ignore_builtin=False,
+        threshold: int = 1,
+        context: list[str] = None,
     ) -> list[int]:
-        """Returns a list of Tag IDs returned from a string query."""
+        """Uncached implementation of search_tags()."""
         # tag_ids: list[int] = []
         # if query:
         # 	query = query.lower()
@@ -1588,14 +1682,18 @@ class Library:
         # TODO: Make this more efficient (if needed)
         # ids: list[int] = []
         id_weights: list[tuple[int, int]] = []
+        # IDs in id_weights, and the IDs in it with a weight of 0, for O(1) lookups.
+        weighted_ids: set[int] = set()
+        zero_weighted_ids: set[int] = set()
         # partial_id_weights: list[int] = []
         priority_ids: list[int] = []
         # print(f'Query: \"{query}\" -------------------------------------')
-        for string in self._tag_strings_to_id_map:  # O(n), n = tags
+        query = _normalize_tag_string(query)
+        # NOTE: The map's strings are already stripped and lowercased.
+        # O(log n + k), n = tag strings, k = strings starting with the query
+        for string in self._tag_strings_starting_with(query):
             exact_match: bool = False
             partial_match: bool = False
-            query = strip_punctuation(query).lower()
-            string = strip_punctuation(string).lower()
 
             if query == string:
                 exact_match = True
@@ -1615,7 +1713,8 @@ class Library:
                         proceed = True
 
                     if proceed:
-                        if tag_id not in [x[0] for x in id_weights]:
+                        if tag_id not in weighted_ids:
+                            weighted_ids.add(tag_id)
                             if exact_match:
                                 # print(f'[{query}] EXACT MATCH:')
                                 # print(self.get_tag_from_id(tag_id).display_name(self))
@@ -1630,11 +1729,14 @@ class Library:
                                 # time.sleep(0.1)
                                 # ids.append(id)
                                 id_weights.append((tag_id, 0))
+                                zero_weighted_ids.add(tag_id)
                         # O(m), m = # of references
                         if include_cluster:
                             for id in self.get_tag_cluster(tag_id):
-                                if (id, 0) not in id_weights:
+                                if id not in zero_weighted_ids:
                                     id_weights.append((id, 0))
+                                    weighted_ids.add(id)
+                                    zero_weighted_ids.add(id)
 
         # Contextual Weighing
         if context and (
@@ -1710,11 +1812,9 @@ class Library:
         # if len(id_weights) > 1:
         # 	print(f'Context Weights: \"{id_weights}\"')
 
-        final: list[int] = []
-
         # if context and id_weights:
         # 	time.sleep(3)
-        [final.append(idw[0]) for idw in id_weights if idw[0] not in final]  # type: ignore
+        final: list[int] = list(dict.fromkeys(idw[0] for idw in id_weights))
         # print(f'Final IDs: \"{[self.get_tag_from_id(id).display_name(self) for id in final]}\"')
         # print('')
         return final
@@ -1750,115 +1850,89 @@ class Library:
         and re-maps the new strings to its ID via '_map_tag_names_to_tag_id()'.\n
         - Un
         """
-        tag.subtag_ids = [x for x in tag.subtag_ids if x != tag.id]
-
-        # Since the ID stays the same when editing, only the Tag object is needed.
-        # Merging Tags is handled in a different function.
-        old_tag: Tag = self.get_tag(tag.id)
-
-        # Undo and Redo 'self._map_tag_names_to_tag_id(tag)' ===========================================================
-        # got to map[old names] and remove reference to this id.
-        # Remember that _tag_names_to_tag_id_map maps strings to a LIST of ids.
-        # print(
-        #     f'Removing connection from "{old_tag.name.lower()}" to {old_tag.id} in {self._tag_names_to_tag_id_map[old_tag.name.lower()]}')
-        old_name: str = strip_punctuation(old_tag.name).lower()
-        self._tag_strings_to_id_map[old_name].remove(old_tag.id)
-        # Delete the map key if it doesn't point to any other IDs.
-        if not self._tag_strings_to_id_map[old_name]:
-            del self._tag_strings_to_id_map[old_name]
-        if old_tag.shorthand:
-            old_sh: str = strip_punctuation(old_tag.shorthand).lower()
-            # print(
-            #     f'Removing connection from "{old_tag.shorthand.lower()}" to {old_tag.id} in {self._tag_names_to_tag_id_map[old_tag.shorthand.lower()]}')
-            self._tag_strings_to_id_map[old_sh].remove(old_tag.id)
-            # Delete the map key if it doesn't point to any other IDs.
-            if not self._tag_strings_to_id_map[old_sh]:
-                del self._tag_strings_to_id_map[old_sh]
-        if old_tag.aliases:
-            for alias in old_tag.aliases:
-                old_a: str = strip_punctuation(alias).lower()
-                # print(
-                #     f'Removing connection from "{alias.lower()}" to {old_tag.id} in {self._tag_names_to_tag_id_map[alias.lower()]}')
-                self._tag_strings_to_id_map[old_a].remove(old_tag.id)
-                # Delete the map key if it doesn't point to any other IDs.
-                if not self._tag_strings_to_id_map[old_a]:
-                    del self._tag_strings_to_id_map[old_a]
-        # then add new reference to this id at map[new names]
-        # print(f'Mapping new names for "{tag.name.lower()}" (ID: {tag.id})')
-        self._map_tag_strings_to_tag_id(tag)
-
-        # Redo 'self.tags.append(tag)' =================================================================================
-        # then swap out the tag in the tags list to this one
-        # print(f'Swapping {self.tags[self._tag_id_to_index_map[old_tag.id]]} *FOR* {tag} in tags list.')
-        self.tags[self._tag_id_to_index_map[old_tag.id]] = tag
-        print(f"Edited Tag: {tag}")
-
-        # Undo and Redo 'self._map_tag_id_to_cluster(tag)' =============================================================
-        # NOTE: Currently the tag is getting updated outside of this due to python
-        # entanglement shenanigans so for now this method will always update the cluster maps.
-        # if old_tag.subtag_ids != tag.subtag_ids:
-        # TODO: Optimize this by 1,000,000% buy building an inverse recursive map function
-        # instead of literally just deleting the whole map and building it again
-        # print('Reticulating Splines...')
-        self._tag_id_to_cluster_map.clear()
-        for tag in self.tags:
-            self._map_tag_id_to_cluster(tag)
-            # print('Splines Reticulated.')
+        with self._tag_lock:
+            tag.subtag_ids = [x for x in tag.subtag_ids if x != tag.id]
+            self._search_tags_cache.clear()
+
+            # Since the ID stays the same when editing, only the Tag object is needed.
+            # Merging Tags is handled in a different function.
+            old_tag: Tag = self.get_tag(tag.id)
+
+            # Undo and Redo 'self._map_tag_names_to_tag_id(tag)' ===========================================================
+            # got to map[old names] and remove reference to this id.
+            self._unmap_tag_strings_from_tag_id(old_tag)
+            # then add new reference to this id at map[new names]
+            # print(f'Mapping new names for "{tag.name.lower()}" (ID: {tag.id})')
+            self._map_tag_strings_to_tag_id(tag)
+
+            # Redo 'self.tags.append(tag)' =================================================================================
+            # then swap out the tag in the tags list to this one
+            # print(f'Swapping {self.tags[self._tag_id_to_index_map[old_tag.id]]} *FOR* {tag} in tags list.')
+            self.tags[self._tag_id_to_index_map[old_tag.id]] = tag
+            print(f"Edited Tag: {tag}")
+
+            # Undo and Redo 'self._map_tag_id_to_cluster(tag)' =============================================================
+            # NOTE: Currently the tag is getting updated outside of this due to python
+            # entanglement shenanigans so for now this method will always update the cluster maps.
+            # if old_tag.subtag_ids != tag.subtag_ids:
+            # TODO: Optimize this by 1,000,000% buy building an inverse recursive map function
+            # instead of literally just deleting the whole map and building it again
+            # print('Reticulating Splines...')
+            self._tag_id_to_cluster_map.clear()
+            for tag in self.tags:
+                self._map_tag_id_to_cluster(tag)
+                # print('Splines Reticulated.')
 
-            self._map_tag_id_to_cluster(tag)
+                self._map_tag_id_to_cluster(tag)
 
     def remove_tag(self, tag_id: int) -> None:
         """
         Removes a Tag from the Library.
         Disconnects it from all internal lists and maps, then remaps others as needed.
         """
-        tag = self.get_tag(tag_id)
-
-        # Step [1/7]:
-        # Remove from Entries.
-        for e in self.entries:
-            if e.fields:
-                for f in e.fields:
-                    if self.get_field_attr(f, "type") == "tag_box":
-                        if tag_id in self.get_field_attr(f, "content"):
-                            self.get_field_attr(f, "content").remove(tag.id)
-
-        # Step [2/7]:
-        # Remove from Subtags.
-        for t in self.tags:
-            if t.subtag_ids:
-                if tag_id in t.subtag_ids:
-                    t.subtag_ids.remove(tag.id)
-
-        # Step [3/7]:
-        # Remove ID -> cluster reference.
-        if tag_id in self._tag_id_to_cluster_map:
-            del self._tag_id_to_cluster_map[tag.id]
-        # Remove mentions of this ID in all clusters.
-        for key, values in self._tag_id_to_cluster_map.items():
-            if tag_id in values:
-                values.remove(tag.id)
-
-        # Step [4/7]:
-        # Remove mapping of this ID to its index in the tags list.
-        if tag.id in self._tag_id_to_index_map:
-            del self._tag_id_to_index_map[tag.id]
-
-        # Step [5/7]:
-        # Remove this Tag from the tags list.
-        self.tags.remove(tag)
-
-        # Step [6/7]:
-        # Remap the other Tag IDs to their new indices in the tags list.
-        self._tag_id_to_index_map.clear()
-        for i, t in enumerate(self.tags):
-            self._map_tag_id_to_index(t, i)
-
-        # Step [7/7]:
-        # Remap all existing Tag names.
-        self._tag_strings_to_id_map.clear()
-        for t in self.tags:
-            self._map_tag_strings_to_tag_id(t)
+        with self._tag_lock:
+            tag = self.get_tag(tag_id)
+
+            # Step [1/7]:
+            # Remove from Entries.
+            for e in self.entries:
+                if e.fields:
+                    for f in e.fields:
+                        if self.get_field_attr(f, "type") == "tag_box":
+                            if tag_id in self.get_field_attr(f, "content"):
+                                self.get_field_attr(f, "content").remove(tag.id)
+
+            # Step [2/7]:
+            # Remove from Subtags.
+            for t in self.tags:
+                if t.subtag_ids:
+                    if tag_id in t.subtag_ids:
+                        t.subtag_ids.remove(tag.id)
+
+            # Step [3/7]:
+            # Remove ID -> cluster reference.
+            if tag_id in self._tag_id_to_cluster_map:
+                del self._tag_id_to_cluster_map[tag.id]
+            # Remove mentions of this ID in all clusters.
+            for values in self._tag_id_to_cluster_map.values():
+                values.pop(tag.id, None)
+
+            # Step [4/7]:
+            # Remove mapping of this ID to its index in the tags list.
+            removed_index: int = self._tag_id_to_index_map.pop(tag.id)
+
+            # Step [5/7]:
+            # Remove this Tag from the tags list.
+            del self.tags[removed_index]
+
+            # Step [6/7]:
+            # Remap only the Tag IDs that came after it to their new indices.
+            for i in range(removed_index, len(self.tags)):
+                self._map_tag_id_to_index(self.tags[i], i)
+
+            # Step [7/7]:
+            # Unmap this Tag's names.
+            self._unmap_tag_strings_from_tag_id(tag)
 
     def get_tag_ref_count(self, tag_id: int) -> tuple[int, int]:
         """Returns an int tuple (entry_ref_count, subtag_ref_count) of Tag reference counts."""
@@ -1892,54 +1966,88 @@ class Library:
     def update_entry_field(self, entry_id: int, field_index: int, content, mode: str):
         """Updates an Entry's specific field. Modes: append, remove, replace."""
 
-        field_id: int = list(self.get_entry(entry_id).fields[field_index].keys())[0]
-        if mode.lower() == "append" or mode.lower() == "extend":
+        field: dict = self.get_entry(entry_id).fields[field_index]
+        field_id: int = next(iter(field))
+        mode = mode.lower()
+        if mode == "append" or mode == "extend":
+            target: list = field[field_id]
+            existing: set = set(target)
             for i in content:
-                if i not in self.get_entry(entry_id).fields[field_index][field_id]:
-                    self.get_entry(entry_id).fields[field_index][field_id].append(i)
-        elif mode.lower() == "replace":
-            self.get_entry(entry_id).fields[field_index][field_id] = content
-        elif mode.lower() == "remove":
+                if i not in existing:
+                    target.append(i)
+                    existing.add(i)
+        elif mode == "replace":
+            field[field_id] = content
+        elif mode == "remove":
+            target = field[field_id]
             for i in content:
-                self.get_entry(entry_id).fields[field_index][field_id].remove(i)
+                target.remove(i)
 
     def does_field_content_exist(self, entry_id: int, field_id: int, content) -> bool:
         """Returns whether or not content exists in a specific entry field type."""
         # entry = self.entries[entry_index]
-        entry = self.get_entry(entry_id)
-        indices = self.get_field_index_in_entry(entry, field_id)
-        for i in indices:
-            if self.get_field_attr(entry.fields[i], "content") == content:
-                return True
-        return False
+        return self._does_field_content_exist(
+            self.get_entry(entry_id), field_id, content
+        )
+
+    def _does_field_content_exist(self, entry: Entry, field_id: int, content) -> bool:
+        """Returns whether or not content exists in an Entry's field type."""
+        # Scans the fields once, without building a list of matching indices.
+        field_id = int(field_id)
+        return any(
+            field_id in field and field[field_id] == content for field in entry.fields
+        )
+
+    def _add_field_content_if_missing(
+        self,
+        entry: Entry,
+        field_id: int,
+        content: str,
+        present: set[tuple[int, str]],
+    ):
+        """
+        Adds a Field with the given content to an Entry if it doesn't exist yet.
+        Uses and updates a set of the Entry's existing (Field ID, content) pairs.
+        """
+        field_id = int(field_id)
+        if (field_id, content) not in present:
+            if self._add_field_to_entry(entry, field_id):
+                entry.fields[-1][field_id] = content
+                present.add((field_id, content))
 
     def add_generic_data_to_entry(self, data, entry_id: int):
         """Adds generic data to an Entry on a "best guess" basis. Used in adding scraped data."""
         if data:
+            entry = self.get_entry(entry_id)
+            # Every (Field ID, content) pair already on the Entry, so each field
+            # below is checked without rescanning the Entry's fields.
+            present: set[tuple[int, str]] = {
+                (int(field_id), content)
+                for field in entry.fields
+                for field_id, content in field.items()
+                if isinstance(content, str)
+            }
+
             # Add a Title Field if the data doesn't already exist.
             if data.get("title"):
                 field_id = 0  # Title Field ID
-                if not self.does_field_content_exist(entry_id, field_id, data["title"]):
-                    self.add_field_to_entry(entry_id, field_id)
-                    self.update_entry_field(entry_id, -1, data["title"], "replace")
+                self._add_field_content_if_missing(
+                    entry, field_id, data["title"], present
+                )
 
             # Add an Author Field if the data doesn't already exist.
             if data.get("author"):
                 field_id = 1  # Author Field ID
-                if not self.does_field_content_exist(
-                    entry_id, field_id, data["author"]
-                ):
-                    self.add_field_to_entry(entry_id, field_id)
-                    self.update_entry_field(entry_id, -1, data["author"], "replace")
+                self._add_field_content_if_missing(
+                    entry, field_id, data["author"], present
+                )
 
             # Add an Artist Field if the data doesn't already exist.
             if data.get("artist"):
                 field_id = 2  # Artist Field ID
-                if not self.does_field_content_exist(
-                    entry_id, field_id, data["artist"]
-                ):
-                    self.add_field_to_entry(entry_id, field_id)
-                    self.update_entry_field(entry_id, -1, data["artist"], "replace")
+                self._add_field_content_if_missing(
+                    entry, field_id, data["artist"], present
+                )
 
             # Add a Date Published Field if the data doesn't already exist.
             if data.get("date_published"):
@@ -1949,10 +2057,7 @@ class Library:
                         data["date_published"], "%Y-%m-%d %H:%M:%S"
                     )
                 )
-                if not self.does_field_content_exist(entry_id, field_id, date):
-                    self.add_field_to_entry(entry_id, field_id)
-                    # entry = self.entries[entry_id]
-                    self.update_entry_field(entry_id, -1, date, "replace")
+                self._add_field_content_if_missing(entry, field_id, date, present)
 
             # Process String Tags if the data doesn't already exist.
             if data.get("tags"):
@@ -1971,55 +2076,67 @@ class Library:
                 # 		extra += tag.split('-')
                 # tags = tags + extra
                 # tags = list(set(tags))
-                extra: list[str] = []
-                for tag in tags:
-                    if len(tag.split("_(")) > 1:
-                        extra += tag.replace(")", "").split("_(")
-                tags += extra
-                tags = list(set(tags))
-                tags.sort()
-
-                while "" in tags:
-                    tags.remove("")
+                # Also add the parts of disambiguated tags, e.g. "name_(series)"
+                # -> "name", "series", then dedupe, sort, and drop empties.
+                extra: set[str] = {
+                    part
+                    for tag in tags
+                    if "_(" in tag
+                    for part in tag.replace(")", "").split("_(")
+                }
+                tags = sorted(tag for tag in extra.union(tags) if tag)
 
                 # # If the tags were a single string (space delimitated), split them into a list.
                 # if isinstance(data["tags"], str):
                 # 	tags.clear()
                 # 	tags = data["tags"].split(' ')
 
+                # NOTE: The following commented-out code enables the ability
+                # to prefer an existing built-in tag_box field to add to
+                # rather than preferring or creating a 'Content Tags' felid.
+                # In my experience, this feature isn't actually what I want,
+                # but the idea behind it isn't bad. Maybe this could be
+                # user configurable and scale with custom fields.
+
+                # tag_field_indices = self.get_field_index_in_entry(
+                # 	entry_index, tags_field_id)
+                content_tags_field_indices = self.get_field_index_in_entry(
+                    entry, content_tags_field_id
+                )
+                # meta_tags_field_indices = self.get_field_index_in_entry(
+                # 	entry_index, meta_tags_field_id)
+
+                # Found once up front, then kept in step with any Content Tags
+                # Field added below, instead of rescanning fields for every tag.
+                priority_field_index = -1
+                if content_tags_field_indices:
+                    priority_field_index = content_tags_field_indices[0]
+                # elif tag_field_indices:
+                # 	priority_field_index = tag_field_indices[0]
+                # elif meta_tags_field_indices:
+                # 	priority_field_index = meta_tags_field_indices[0]
+
                 # Try to add matching tags in library.
                 for tag in tags:
-                    matching: list[int] = self.search_tags(
-                        tag.replace("_", " ").replace("-", " "),
-                        include_cluster=False,
-                        ignore_builtin=True,
-                        threshold=2,
-                        context=tags,
-                    )
-                    priority_field_index = -1
-                    if matching:
-                        # NOTE: The following commented-out code enables the ability
-                        # to prefer an existing built-in tag_box field to add to
-                        # rather than preferring or creating a 'Content Tags' felid.
-                        # In my experience, this feature isn't actually what I want,
-                        # but the idea behind it isn't bad. Maybe this could be
-                        # user configurable and scale with custom fields.
-
-                        # tag_field_indices = self.get_field_index_in_entry(
-                        # 	entry_index, tags_field_id)
-                        content_tags_field_indices = self.get_field_index_in_entry(
-                            self.get_entry(entry_id), content_tags_field_id
+                    query = tag.replace("_", " ").replace("-", " ")
+                    # An unambiguous exact name/alias hit is what search_tags would
+                    # rank first, so skip its full scan of every Tag string.
+                    matching: list[int] = [
+                        id
+                        for id in self._tag_strings_to_id_map.get(
+                            _normalize_tag_string(query), ()
                         )
-                        # meta_tags_field_indices = self.get_field_index_in_entry(
-                        # 	entry_index, meta_tags_field_id)
-
-                        if content_tags_field_indices:
-                            priority_field_index = content_tags_field_indices[0]
-                        # elif tag_field_indices:
-                        # 	priority_field_index = tag_field_indices[0]
-                        # elif meta_tags_field_indices:
-                        # 	priority_field_index = meta_tags_field_indices[0]
-
+                        if id >= 1000
+                    ]
+                    if len(matching) != 1:
+                        matching = self.search_tags(
+                            query,
+                            include_cluster=False,
+                            ignore_builtin=True,
+                            threshold=2,
+                            context=tags,
+                        )
+                    if matching:
                         if priority_field_index > 0:
                             self.update_entry_field(
                                 entry_id, priority_field_index, [matching[0]], "append"
@@ -2029,109 +2146,108 @@ class Library:
                             self.update_entry_field(
                                 entry_id, -1, [matching[0]], "append"
                             )
+                            if priority_field_index < 0:
+                                priority_field_index = len(entry.fields) - 1
 
                 # Add all original string tags as a note.
                 str_tags = f"Original Tags: {tags}"
-                if not self.does_field_content_exist(
-                    entry_id, notes_field_id, str_tags
-                ):
-                    self.add_field_to_entry(entry_id, notes_field_id)
-                    self.update_entry_field(entry_id, -1, str_tags, "replace")
+                self._add_field_content_if_missing(
+                    entry, notes_field_id, str_tags, present
+                )
 
             # Add a Description Field if the data doesn't already exist.
             if "description" in data.keys() and data["description"]:
                 field_id = 4  # Description Field ID
-                if not self.does_field_content_exist(
-                    entry_id, field_id, data["description"]
-                ):
-                    self.add_field_to_entry(entry_id, field_id)
-                    self.update_entry_field(
-                        entry_id, -1, data["description"], "replace"
-                    )
+                self._add_field_content_if_missing(
+                    entry, field_id, data["description"], present
+                )
             if "content" in data.keys() and data["content"]:
                 field_id = 4  # Description Field ID
-                if not self.does_field_content_exist(
-                    entry_id, field_id, data["content"]
-                ):
-                    self.add_field_to_entry(entry_id, field_id)
-                    self.update_entry_field(entry_id, -1, data["content"], "replace")
+                self._add_field_content_if_missing(
+                    entry, field_id, data["content"], present
+                )
             if "source" in data.keys() and data["source"]:
                 field_id = 21  # Source Field ID
                 for source in data["source"].split(" "):
                     if source and source != " ":
                         source = strip_web_protocol(string=source)
-                        if not self.does_field_content_exist(
-                            entry_id, field_id, source
-                        ):
-                            self.add_field_to_entry(entry_id, field_id)
-                            self.update_entry_field(entry_id, -1, source, "replace")
+                        self._add_field_content_if_missing(
+                            entry, field_id, source, present
+                        )
 
     def add_field_to_entry(self, entry_id: int, field_id: int) -> None:
         """Adds an empty Field, specified by Field ID, to an Entry via its index."""
         # entry = self.entries[entry_index]
-        entry = self.get_entry(entry_id)
+        self._add_field_to_entry(self.get_entry(entry_id), field_id)
+
+    def _add_field_to_entry(self, entry: Entry, field_id: int) -> bool:
+        """
+        Adds an empty Field, specified by Field ID, to an Entry.
+        Returns whether or not the Field was added.
+        """
+        field_id = int(field_id)
         field_type = self.get_field_obj(field_id)["type"]
         if field_type in TEXT_FIELDS:
-            entry.fields.append({int(field_id): ""})
+            entry.fields.append({field_id: ""})
         elif field_type == "tag_box":
-            entry.fields.append({int(field_id): []})
+            entry.fields.append({field_id: []})
         elif field_type == "datetime":
-            entry.fields.append({int(field_id): ""})
+            entry.fields.append({field_id: ""})
         else:
             logging.info(
                 f"[LIBRARY][ERROR]: Unknown field id attempted to be added to entry: {field_id}"
             )
+            return False
+        return True
 
     def mirror_entry_fields(self, entry_ids: list[int]) -> None:
         """Combines and mirrors all fields across a list of given Entry IDs."""
 
+        # Look each Entry up once for both the merge and the write back.
+        entries: list[tuple[int, Entry]] = [
+            (id, self.get_entry(id)) for id in entry_ids
+        ]
+
         all_fields: list = []
-        all_ids: list = []  # Parallel to all_fields
+        # Tag box Field ID -> the merged tag box Field and a set of its Tag IDs.
+        tag_boxes: dict[int, tuple[dict, set[int]]] = {}
+        # (Field ID, content) of every other Field already merged.
+        other_fields: set[tuple[int, str]] = set()
         # Extract and merge all fields from all given Entries.
-        for id in entry_ids:
+        for id, entry in entries:
             if id:
-                entry = self.get_entry(id)
                 if entry and entry.fields:
                     for field in entry.fields:
-                        # First checks if their are matching tag_boxes to append to
-                        if (
-                            self.get_field_attr(field, "type") == "tag_box"
-                            and self.get_field_attr(field, "id") in all_ids
-                        ):
-                            content = self.get_field_attr(field, "content")
-                            for i in content:
-                                id = int(self.get_field_attr(field, "id"))
-                                field_index = all_ids.index(id)
-                                if i not in all_fields[field_index][id]:
-                                    all_fields[field_index][id].append(i)
+                        field_id = int(self.get_field_attr(field, "id"))
+                        content = self.get_field_attr(field, "content")
+                        if self.get_field_attr(field, "type") == "tag_box":
+                            # First checks if their are matching tag_boxes to append to
+                            if field_id in tag_boxes:
+                                merged_field, merged_ids = tag_boxes[field_id]
+                                for i in content:
+                                    if i not in merged_ids:
+                                        merged_field[field_id].append(i)
+                                        merged_ids.add(i)
+                            else:
+                                all_fields.append(field)
+                                tag_boxes[field_id] = (field, set(content))
                         # If not, go ahead and whichever new field.
-                        elif field not in all_fields:
+                        elif (field_id, content) not in other_fields:
                             all_fields.append(field)
-                            all_ids.append(int(self.get_field_attr(field, "id")))
+                            other_fields.add((field_id, content))
+
+        # The merged fields are the same for every Entry, so only sort them once.
+        # NOTE: This code is copied from the sort_fields() method.
+        all_fields.sort(
+            key=lambda x: MIRRORED_FIELD_RANK.get(
+                self.get_field_attr(x, "id"), len(MIRRORED_FIELD_RANK)
+            )
+        )
 
         # Replace each Entry's fields with the new merged ones.
-        for id in entry_ids:
-            entry = self.get_entry(id)
+        for _, entry in entries:
             if entry:
-                entry.fields = all_fields
-
-                # TODO: Replace this and any in CLI with a proper user-defined
-                # field storing method.
-                order: list[int] = (
-                    [0]
-                    + [1, 2]
-                    + [9, 17, 18, 19, 20]
-                    + [10, 14, 11, 12, 13, 22]
-                    + [4, 5]
-                    + [8, 7, 6]
-                    + [3, 21]
-                )
-
-                # NOTE: This code is copied from the sort_fields() method.
-                entry.fields = sorted(
-                    entry.fields,
-                    key=lambda x: order.index(self.get_field_attr(x, "id")),
-                )
+                entry.fields = list(all_fields)
 
     # def move_entry_field(self, entry_index, old_index, new_index) -> None:
     # 	"""Moves a field in entry[entry_index] from position entry.fields[old_index] to entry.fields[new_index]"""
@@ -2140,23 +2256,26 @@ class Library:
     # 	# TODO: Implement.
 
     def get_field_attr(self, entry_field: dict, attribute: str):
-        """Returns the value of a specified attribute inside an Entry field."""
-        if attribute.lower() == "id":
-            return list(entry_field.keys())[0]
-        elif attribute.lower() == "content":
-            return entry_field[self.get_field_attr(entry_field, "id")]
+        """
+        Returns the value of a specified attribute inside an Entry field.
+        The attribute name is expected in lowercase (e.g. "id", "content", "type").
+        """
+        field_id = next(iter(entry_field))
+        if attribute == "id":
+            return field_id
+        elif attribute == "content":
+            return entry_field[field_id]
         else:
-            return self.get_field_obj(self.get_field_attr(entry_field, "id"))[
-                attribute.lower()
-            ]
+            return self.get_field_obj(field_id)[attribute]
 
     def get_field_obj(self, field_id: int) -> dict:
         """
         Returns a field template object associated with a field ID.
         The objects have "id", "name", and "type" fields.
         """
-        if int(field_id) < len(self.default_fields):
-            return self.default_fields[int(field_id)]
+        field_id = int(field_id)
+        if field_id < len(self.default_fields):
+            return self.default_fields[field_id]
         else:
             return {"id": -1, "name": "Unknown Field", "type": "unknown"}
 
@@ -2165,68 +2284,104 @@ class Library:
         Returns matched indices for the field type in an entry.\n
         Returns an empty list of no field of that type is found in the entry.
         """
-        matched = []
         # entry: Entry = self.entries[entry_index]
         # entry = self.get_entry(entry_id)
-        if entry.fields:
-            for i, field in enumerate(entry.fields):
-                if self.get_field_attr(field, "id") == int(field_id):
-                    matched.append(i)
+        if not entry.fields:
+            return []
 
-        return matched
+        # Each field is a single-key {field_id: content} dict.
+        field_id = int(field_id)
+        return [i for i, field in enumerate(entry.fields) if field_id in field]
 
     def _map_tag_strings_to_tag_id(self, tag: Tag) -> None:
         """
-        Maps a Tag's name, shorthand, and aliases to their ID's (in the form of a list).\n
+        Maps a Tag's name, shorthand, and aliases to their ID's (in the form of a tuple).\n
         ⚠️DO NOT USE FOR CONFIDENT DATA REFERENCES!⚠️\n
         This is intended to be used for quick search queries.\n
         Uses name_and_alias_to_tag_id_map.
         """
-        # tag_id: int, tag_name: str, tag_aliases: list[str] = []
-        name: str = strip_punctuation(tag.name).lower()
-        if name not in self._tag_strings_to_id_map:
-            self._tag_strings_to_id_map[name] = []
-        self._tag_strings_to_id_map[name].append(tag.id)
+        self._search_tags_cache.clear()
+        self._sorted_tag_strings = None
+        tag_strings_to_ids = self._tag_strings_to_id_map
+        for string in [tag.name, tag.shorthand, *tag.aliases]:
+            key: str = _normalize_tag_string(string)
+            tag_strings_to_ids[key] = tag_strings_to_ids.get(key, ()) + (tag.id,)
+
+    def _map_all_tag_strings_to_tag_ids(self) -> None:
+        """
+        Maps the name, shorthand, and aliases of every Tag in self.tags to their ID's.
+        Does the work of '_map_tag_strings_to_tag_id()' for every Tag at once,
+        collecting each string's IDs in a list before storing them as a tuple.
+        """
+        self._search_tags_cache.clear()
+        self._sorted_tag_strings = None
+        tag_strings_to_ids: dict[str, list[int]] = {}
+        for tag in self.tags:
+            for string in [tag.name, tag.shorthand, *tag.aliases]:
+                key: str = _normalize_tag_string(string)
+                tag_strings_to_ids.setdefault(key, []).append(tag.id)
+        self._tag_strings_to_id_map = {
+            key: tuple(ids) for key, ids in tag_strings_to_ids.items()
+        }
 
-        shorthand: str = strip_punctuation(tag.shorthand).lower()
-        if shorthand not in self._tag_strings_to_id_map:
-            self._tag_strings_to_id_map[shorthand] = []
-        self._tag_strings_to_id_map[shorthand].append(tag.id)
+    def _unmap_tag_strings_from_tag_id(self, tag: Tag) -> None:
+        """
+        Removes a Tag's name, shorthand, and aliases mappings to its ID.
+        Undoes '_map_tag_strings_to_tag_id()' without remapping any other Tags.
+        """
+        self._search_tags_cache.clear()
+        self._sorted_tag_strings = None
+        for string in [tag.name, tag.shorthand, *tag.aliases]:
+            key: str = _normalize_tag_string(string)
+            ids = self._tag_strings_to_id_map.get(key, ())
+            if tag.id in ids:
+                # Only drop one reference, as a string may be mapped more than once.
+                i = ids.index(tag.id)
+                ids = ids[:i] + ids[i + 1 :]
+                if ids:
+                    self._tag_strings_to_id_map[key] = ids
+                else:
+                    # Delete the map key if it doesn't point to any other IDs.
+                    del self._tag_strings_to_id_map[key]
 
-        for alias in tag.aliases:
-            alias = strip_punctuation(alias).lower()
-            if alias not in self._tag_strings_to_id_map:
-                self._tag_strings_to_id_map[alias] = []
-            self._tag_strings_to_id_map[alias].append(tag.id)
-            # print(f'{alias.lower()} -> {tag.id}')
+    def _tag_strings_starting_with(self, prefix: str) -> list[str]:
+        """
+        Returns the mapped Tag strings that start with a prefix,
+        in the same order as they appear in _tag_strings_to_id_map.
+        """
+        if self._sorted_tag_strings is None:
+            self._sorted_tag_strings = sorted(self._tag_strings_to_id_map)
+            self._tag_string_positions = {
+                string: i for i, string in enumerate(self._tag_strings_to_id_map)
+            }
+        sorted_strings = self._sorted_tag_strings
+        start = end = bisect.bisect_left(sorted_strings, prefix)
+        while end < len(sorted_strings) and sorted_strings[end].startswith(prefix):
+            end += 1
+        return sorted(
+            sorted_strings[start:end], key=self._tag_string_positions.__getitem__
+        )
 
-    def _map_tag_id_to_cluster(self, tag: Tag, subtags: list[Tag] = None) -> None:
+    def _map_tag_id_to_cluster(self, tag: Tag) -> None:
         """
-        Maps a Tag's subtag's ID's back to it's parent Tag's ID (in the form of a list).
+        Maps a Tag's subtag's ID's back to it's parent Tag's ID (in the form of an ordered set).
         Uses tag_id_to_cluster_map.\n
         EX: Tag: "Johnny Bravo", Subtags: "Cartoon Network (TV)", "Character".\n
         Maps "Cartoon Network" -> Johnny Bravo, "Character" -> "Johnny Bravo", and "TV" -> Johnny Bravo."
         """
-        # If a list of subtags is not provided, the method will revert to a level 1-depth
-        # mapping based on the given Tag's own subtags.
-        if not subtags:
-            subtags = [self.get_tag(sub_id) for sub_id in tag.subtag_ids]
-        for subtag in subtags:
-            if subtag.id not in self._tag_id_to_cluster_map.keys():
-                self._tag_id_to_cluster_map[subtag.id] = []
-            # Stops circular references
-            if tag.id not in self._tag_id_to_cluster_map[subtag.id]:
-                self._tag_id_to_cluster_map[subtag.id].append(tag.id)
-                # If the subtag has subtags of it own, recursively link those to the original Tag.
-                if subtag.subtag_ids:
-                    self._map_tag_id_to_cluster(
-                        tag,
-                        [
-                            self.get_tag(sub_id)
-                            for sub_id in subtag.subtag_ids
-                            if sub_id != tag.id
-                        ],
-                    )
+        self._search_tags_cache.clear()
+        cluster_map = self._tag_id_to_cluster_map
+        # Walks every subtag reachable from the Tag once, which also stops
+        # circular references and shared (diamond) subtag paths.
+        seen: set[int] = {tag.id}
+        stack: list[int] = list(tag.subtag_ids)
+        while stack:
+            subtag_id = stack.pop()
+            if subtag_id in seen:
+                continue
+            seen.add(subtag_id)
+            cluster_map.setdefault(subtag_id, {})[tag.id] = None
+            stack.extend(self.get_tag(subtag_id).subtag_ids)
 
     def _map_tag_id_to_index(self, tag: Tag, index: int) -> None:
         """
@@ -2239,6 +2394,19 @@ class Library:
         self._tag_id_to_index_map[tag.id] = index
         # print(f'{tag.id} - {self._tag_id_to_index_map[tag.id]}')
 
+    def _get_entry_index(self, entry_id: int) -> int:
+        """
+        Returns the index in self.entries of the Entry with the given ID.
+        Raises a KeyError if no Entry has that ID.
+        """
+        entry_id = int(entry_id)
+        offset = entry_id - self._entry_id_base
+        if 0 <= offset < len(self._entry_id_to_index_map):
+            index = self._entry_id_to_index_map[offset]
+            if index >= 0:
+                return index
+        return self._sparse_entry_id_to_index_map[entry_id]
+
     def _map_entry_id_to_index(self, entry: Entry, index: int) -> None:
         """
         Maps an Entry's ID to the Entry's Index in self.entries.
@@ -2247,10 +2415,50 @@ class Library:
         # if index != None:
         if index < 0:
             index = len(self.entries) + index
-        self._entry_id_to_index_map[entry.id] = index
+        entry_id = int(entry.id)
+        id_to_index = self._entry_id_to_index_map
+        if not id_to_index and entry_id >= 0:
+            self._entry_id_base = entry_id
+        offset = entry_id - self._entry_id_base
+        if not 0 <= offset < len(id_to_index):
+            low = min(self._entry_id_base, entry_id)
+            high = max(self._entry_id_base + len(id_to_index), entry_id + 1)
+            max_span = ENTRY_ID_MAP_MAX_SPARSENESS * max(
+                len(self.entries) + 1, ENTRY_ID_MAP_MIN_SLOTS
+            )
+            if entry_id < 0 or high - low > max_span:
+                self._sparse_entry_id_to_index_map[entry_id] = index
+                return
+            if offset < 0:
+                # Over-allocate downwards so IDs arriving in descending order
+                # don't copy the whole array each time.
+                new_base = max(0, min(entry_id, self._entry_id_base - len(id_to_index)))
+                id_to_index[:0] = array.array(
+                    "q", itertools.repeat(-1, self._entry_id_base - new_base)
+                )
+                self._entry_id_base = new_base
+                offset = entry_id - new_base
+            else:
+                id_to_index.extend(itertools.repeat(-1, offset + 1 - len(id_to_index)))
+        id_to_index[offset] = index
+        self._sparse_entry_id_to_index_map.pop(entry_id, None)
         # else:
         # 	self._entry_id_to_index_map[entry.id_] = self.entries.index(entry)
 
+    def _unmap_entry_id(self, entry_id: int) -> None:
+        """Removes an Entry ID from _entry_id_to_index_map."""
+        entry_id = int(entry_id)
+        offset = entry_id - self._entry_id_base
+        if 0 <= offset < len(self._entry_id_to_index_map):
+            self._entry_id_to_index_map[offset] = -1
+        self._sparse_entry_id_to_index_map.pop(entry_id, None)
+
+    def _clear_entry_id_to_index_map(self) -> None:
+        """Empties _entry_id_to_index_map."""
+        del self._entry_id_to_index_map[:]
+        self._entry_id_base = 0
+        self._sparse_entry_id_to_index_map.clear()
+
     def _map_collation_id_to_index(self, collation: Collation, index: int) -> None:
         """
         Maps a Collation's ID to the Collation's Index in self.collations.
@@ -2267,16 +2475,17 @@ class Library:
         For adding Tags from the Library save file, append Tags to the Tags list
         and then map them using map_library_tags().
         """
-        tag.subtag_ids = [x for x in tag.subtag_ids if x != tag.id]
-        tag.id = self._next_tag_id
-        self._next_tag_id += 1
-
-        self._map_tag_strings_to_tag_id(tag)
-        self.tags.append(tag)  # Must be appended before mapping the index!
-        self._map_tag_id_to_index(tag, -1)
-        self._map_tag_id_to_cluster(tag)
+        with self._tag_lock:
+            tag.subtag_ids = [x for x in tag.subtag_ids if x != tag.id]
+            tag.id = self._next_tag_id
+            self._next_tag_id += 1
+
+            self._map_tag_strings_to_tag_id(tag)
+            self._map_tag_id_to_index(tag, len(self.tags))
+            self.tags.append(tag)
+            self._map_tag_id_to_cluster(tag)
 
-        return tag.id
+            return tag.id
 
     def get_tag(self, tag_id: int) -> Tag:
         """Returns a Tag object given a Tag ID."""
@@ -2284,13 +2493,12 @@ class Library:
 
     def get_tag_cluster(self, tag_id: int) -> list[int]:
         """Returns a list of Tag IDs that reference this Tag."""
-        if tag_id in self._tag_id_to_cluster_map:
-            return self._tag_id_to_cluster_map[int(tag_id)]
-        return []
+        return list(self._tag_id_to_cluster_map.get(int(tag_id), ()))
 
     def sort_fields(self, entry_id: int, order: list[int]) -> None:
         """Sorts an Entry's Fields given an ordered list of Field IDs."""
         entry = self.get_entry(entry_id)
+        rank: dict[int, int] = {field_id: i for i, field_id in enumerate(order)}
         entry.fields = sorted(
-            entry.fields, key=lambda x: order.index(self.get_field_attr(x, "id"))
+            entry.fields, key=lambda x: rank[self.get_field_attr(x, "id")]
         )
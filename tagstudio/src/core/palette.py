@@ -2,6 +2,7 @@
 # Licensed under the GPL-3.0 License.
 # Created for TagStudio: https://github.com/CyanVoxel/TagStudio
 
+import functools
 from enum import Enum
 
 
@@ -278,6 +279,7 @@ _TAG_COLORS = {
 }
 
 
+@functools.lru_cache(maxsize=512)
 def get_tag_color(type, color):
     color = color.lower()
     try:
@@ -2,10 +2,12 @@
 # Licensed under the GPL-3.0 License.
 # Created for TagStudio: https://github.com/CyanVoxel/TagStudio
 
+import re
+
+# Leading "https://", "http://", "www.", and "www2." prefixes, in that order.
+_WEB_PROTOCOL_PATTERN = re.compile(r"^(?:https://)?(?:http://)?(?:www\.)?(?:www2\.)?")
+
 
 def strip_web_protocol(string: str) -> str:
     """Strips a leading web protocol (ex. \"https://\") as well as \"www.\" from a string."""
-    prefixes = ["https://", "http://", "www.", "www2."]
-    for prefix in prefixes:
-        string = string.removeprefix(prefix)
-    return string
+    return _WEB_PROTOCOL_PATTERN.sub("", string, count=1)
@@ -1,4 +1,7 @@
-from sqlalchemy import Engine, create_engine
+from typing import Any
+
+from sqlalchemy import Connection, Engine, create_engine, event, make_url
+from sqlalchemy.pool import QueuePool
 
 from .table_declarations.base import Base
 from .table_declarations.entry import Entry
@@ -13,14 +16,61 @@ force_access = [
     TagAlias,
 ]
 
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 
 def make_engine(connection_string: str) -> Engine:
-    return create_engine(connection_string)
+    engine_kwargs: dict[str, Any] = {}
+
+    url = make_url(connection_string)
+    is_sqlite_file = url.get_backend_name() == "sqlite" and url.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+    if is_sqlite_file:
+        # Keep a small pool of long-lived connections to the library file
+        # that any thread may check out, instead of reopening it per thread.
+        # Writes are still serialized by SQLite's single-writer lock.
+        engine_kwargs.update(
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=8,
+            connect_args={"check_same_thread": False},
+        )
+
+    # Lets bulk inserts (executemany) be batched into as few INSERT
+    # statements as the database allows, and keeps more compiled ORM
+    # statements cached than the default of 500.
+    engine = create_engine(
+        connection_string,
+        insertmanyvalues_page_size=10_000,
+        query_cache_size=1200,
+        **engine_kwargs,
+    )
+
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+
+    return engine
 
 
-def make_tables(engine: Engine) -> None:
+def make_tables(engine: Engine | Connection) -> None:
     Base.metadata.create_all(engine)
 
 
-def drop_tables(engine: Engine) -> None:
+def drop_tables(engine: Engine | Connection) -> None:
     Base.metadata.drop_all(engine)
@@ -1,8 +1,9 @@
 from pathlib import Path
 from typing import Sequence, Type, TypeVar
 
-from sqlalchemy import Engine, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Engine, exists, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql.base import ExecutableOption
 from src.database.table_declarations.entry import Entry  # type: ignore
 from src.database.table_declarations.field import (  # type: ignore
     DatetimeField,
@@ -14,14 +15,17 @@ from src.database.table_declarations.tag import Tag  # type: ignore
 
 Queryable = TypeVar("Queryable", Tag, Entry, TextField, DatetimeField, TagBoxField)
 
+# Relationships loaded up front by get_objects_by_ids(), since the results are
+# expunged from the session and can no longer lazy load them.
+EAGER_LOADS: dict[type, tuple[ExecutableOption, ...]] = {
+    Entry: (selectinload(Entry.tags),),
+    Tag: (selectinload(Tag.aliases), selectinload(Tag.subtags)),
+}
+
 
 def path_in_db(path: Path, engine: Engine) -> bool:
     with Session(engine) as session, session.begin():
-        result = session.execute(
-            select(Entry.id).where(Entry.path == path)
-        ).one_or_none()
-
-        result_bool = bool(result)
+        result_bool = bool(session.scalar(select(exists().where(Entry.path == path))))
 
     return result_bool
 
@@ -47,9 +51,11 @@ def get_object_by_id(
     type: Type[Queryable],
     session: Session,
 ) -> Queryable:
-    result: Queryable = session.scalars(
-        select(type).where(type.id == id).limit(1)  # type: ignore
-    ).one()
+    result: Queryable = session.get_one(
+        type,
+        id,
+        options=EAGER_LOADS.get(type, ()),  # type: ignore
+    )
 
     return result
 
@@ -59,9 +65,12 @@ def get_objects_by_ids(
     type: Queryable,
     session: Session,
 ) -> list[Queryable]:
-    results: list[Queryable] = list(
-        session.scalars(select(type).where(type.id.in_(ids))).all()  # type: ignore
+    statement = (
+        select(type)
+        .where(type.id.in_(ids))  # type: ignore
+        .options(*EAGER_LOADS.get(type, ()))  # type: ignore
     )
+    results: list[Queryable] = list(session.scalars(statement).all())
 
     session.expunge_all()
 
@@ -21,6 +21,7 @@ class Entry(Base):
     fields: Mapped[OrderingList[Field]] = relationship(
         order_by="Field.position",
         collection_class=ordering_list("position"),  # type: ignore
+        lazy="selectin",
     )
 
     tags: Mapped[set[Tag]] = relationship(
@@ -68,13 +69,14 @@ class Entry(Base):
     def __init__(
         self,
         path: Path,
-        fields: list[Field] = [],
+        fields: list[Field] | None = None,
     ) -> None:
         self.path = path
         self.type = None
 
         ordering_list_: OrderingList[Field] = OrderingList()  # type: ignore
-        ordering_list_.extend(fields)
+        if fields:
+            ordering_list_.extend(fields)
         self.fields = ordering_list_
 
     def has_tag(self, tag: Tag) -> bool:
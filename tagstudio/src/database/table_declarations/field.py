@@ -1,14 +1,32 @@
 from __future__ import annotations
 
 import datetime
+from enum import Enum
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
 from .tag import TagCategory
 
 
+class TextFieldTypes(Enum):
+    text_line = "text_line"
+    text_box = "text_box"
+
+
+class TagBoxTypes(Enum):
+    tag_box = "tag_box"
+    meta_tag_box = "meta_tag_box"
+
+
+class DateTimeTypes(Enum):
+    datetime = "datetime"
+
+
+FieldType = TextFieldTypes | TagBoxTypes | DateTimeTypes
+
+
 class Field(Base):
     __tablename__ = "fields"
 
@@ -19,6 +37,8 @@ class Field(Base):
         "polymorphic_on": "type",
         "polymorphic_identity": "field",
     }
+    # Fields are looked up by their Entry, often narrowed to one field type.
+    __table_args__ = (Index("ix_fields_entry_id_type", "entry_id", "type"),)
 
     entry_id: Mapped[int] = mapped_column(ForeignKey("entries.id"))
 
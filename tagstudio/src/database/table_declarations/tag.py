@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from tagstudio.src.alt_core.types import TagColor  # type: ignore
@@ -66,9 +66,19 @@ class Tag(Base):
         back_populates="tags",
     )
 
+    # list[int] built by subtag_ids on first use, reset whenever the subtags
+    # may have changed. Left unannotated so the ORM doesn't map it.
+    _subtag_ids = None
+
     @property
     def subtag_ids(self) -> list[int]:
-        return [tag.id for tag in self.subtags]
+        if self._subtag_ids is None:
+            subtag_ids = [tag.id for tag in self.subtags]
+            # Subtags that aren't flushed yet have no ID worth keeping.
+            if None in subtag_ids:
+                return subtag_ids
+            self._subtag_ids = subtag_ids
+        return self._subtag_ids
 
     @property
     def alias_strings(self) -> list[str]:
@@ -79,17 +89,17 @@ class Tag(Base):
         name: str,
         category: TagCategory = TagCategory.user_tag,
         shorthand: str | None = None,
-        aliases: set[TagAlias] = set(),
-        parent_tags: set[Tag] = set(),
-        subtags: set[Tag] = set(),
+        aliases: set[TagAlias] | None = None,
+        parent_tags: set[Tag] | None = None,
+        subtags: set[Tag] | None = None,
         icon: str | None = None,
         color: TagColor = TagColor.default,
     ):
         self.name = name
         self.category = category
-        self.aliases = aliases
-        self.parent_tags = parent_tags
-        self.subtags = subtags
+        self.aliases = aliases if aliases is not None else set()
+        self.parent_tags = parent_tags if parent_tags is not None else set()
+        self.subtags = subtags if subtags is not None else set()
         self.color = color
         self.icon = icon
         self.shorthand = shorthand
@@ -109,7 +119,7 @@ class Tag(Base):
     def display_name(self) -> str:
         """Returns a formatted tag name intended for displaying."""
         if self.subtags:
-            first_subtag = list(self.subtags.copy())[0]
+            first_subtag = next(iter(self.subtags))
             first_subtag_display_name = first_subtag.shorthand or first_subtag.name
             return f"{self.name}" f" ({first_subtag_display_name})"
         else:
@@ -124,6 +134,16 @@ class Tag(Base):
             self.subtags.remove(tag)
 
 
+def _reset_subtag_ids(target: Tag, *args: Any) -> None:
+    target._subtag_ids = None
+
+
+for _identifier in ("append", "remove", "bulk_replace"):
+    event.listen(Tag.subtags, _identifier, _reset_subtag_ids)
+for _identifier in ("expire", "refresh"):
+    event.listen(Tag, _identifier, _reset_subtag_ids)
+
+
 class TagAlias(Base):
     __tablename__ = "tag_aliases"
 
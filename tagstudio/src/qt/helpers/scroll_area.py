@@ -0,0 +1,16 @@
+# Copyright (C) 2024 Travis Abendshien (CyanVoxel).
+# Licensed under the GPL-3.0 License.
+# Created for TagStudio: https://github.com/CyanVoxel/TagStudio
+
+
+from PySide6.QtWidgets import QWidget, QScrollArea, QFrame
+
+
+def make_scroll_area(contents: QWidget) -> QScrollArea:
+    """Returns a frameless, resizable QScrollArea holding the contents widget."""
+    scroll_area = QScrollArea()
+    scroll_area.setWidgetResizable(True)
+    scroll_area.setFrameShadow(QFrame.Shadow.Plain)
+    scroll_area.setFrameShape(QFrame.Shape.NoFrame)
+    scroll_area.setWidget(contents)
+    return scroll_area
@@ -0,0 +1,95 @@
+# Copyright (C) 2024 Travis Abendshien (CyanVoxel).
+# Licensed under the GPL-3.0 License.
+# Created for TagStudio: https://github.com/CyanVoxel/TagStudio
+
+
+from typing import Callable, Generic, Iterable, TypeVar
+
+from PySide6.QtCore import QObject, QTimer, Slot
+from PySide6.QtWidgets import QLayout, QLineEdit, QWidget
+
+Row = TypeVar("Row")
+Item = TypeVar("Item")
+
+
+class SearchDebouncer(QObject):
+    """Runs a search once typing in a search field pauses, skipping repeat queries."""
+
+    def __init__(
+        self, field: QLineEdit, search: Callable[[str], None], delay_ms: int = 120
+    ) -> None:
+        super().__init__(field)
+        self.search = search
+        self.pending_query = ""
+        # The query currently shown, set by whatever runs the search.
+        self.last_query: str | None = None
+        # Typing restarts this timer, so a search only runs once typing pauses.
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.run_pending_search)
+        field.textEdited.connect(self.queue_search)
+
+    @Slot(str)
+    def queue_search(self, query: str):
+        self.pending_query = query
+        self.timer.start()
+
+    @Slot()
+    def run_pending_search(self):
+        if self.pending_query != self.last_query:
+            self.search(self.pending_query)
+
+    def cancel(self) -> bool:
+        """Stops the pending search. Returns whether one was waiting."""
+        was_pending = self.timer.isActive()
+        self.timer.stop()
+        return was_pending
+
+
+class RowPool(Generic[Row, Item]):
+    """Keeps a list's rows between updates and reuses them for different items."""
+
+    def __init__(
+        self,
+        contents: QWidget,
+        layout: QLayout,
+        make_row: Callable[[Item], tuple[QWidget, Row]],
+    ) -> None:
+        self.contents = contents
+        self.layout = layout
+        # Returns a new row's widget, and the row passed back to set_row in show().
+        self.make_row = make_row
+        self.rows: list[tuple[QWidget, Row]] = []
+        # Number of rows currently showing an item.
+        self.shown_count = 0
+
+    def show(
+        self,
+        items: Iterable[Item],
+        set_row: Callable[[Row, Item], None],
+        start: int = 0,
+    ) -> None:
+        """Shows items in the rows from index start onward and hides the rest."""
+        # Lay out and repaint once after every row is updated, rather than
+        # once per row.
+        self.contents.setUpdatesEnabled(False)
+        try:
+            index = start
+            for item in items:
+                if index < len(self.rows):
+                    widget, row = self.rows[index]
+                    set_row(row, item)
+                else:
+                    widget, row = self.make_row(item)
+                    self.layout.addWidget(widget)
+                    self.rows.append((widget, row))
+                widget.setHidden(False)
+                index += 1
+            self.shown_count = index
+            # Hide the rows left over from a longer list of items.
+            for widget, _ in self.rows[index:]:
+                widget.setHidden(True)
+            self.layout.activate()
+        finally:
+            self.contents.setUpdatesEnabled(True)
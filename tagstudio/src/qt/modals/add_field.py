@@ -49,10 +49,12 @@ class AddFieldModal(QWidget):
         self.combo_box.view().setVerticalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAsNeeded
         )
-        for df in self.lib.default_fields:
-            self.combo_box.addItem(
+        self.combo_box.addItems(
+            [
                 f'{df["name"]} ({df["type"].replace("_", " ").title()})'
-            )
+                for df in self.lib.default_fields
+            ]
+        )
 
         self.button_container = QWidget()
         self.button_layout = QHBoxLayout(self.button_container)
@@ -4,16 +4,15 @@
 
 
 import logging
+from functools import lru_cache, partial
 
-from PySide6.QtCore import Signal, Qt
+from PySide6.QtCore import Signal, Slot, Qt
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QLabel,
     QPushButton,
     QLineEdit,
-    QScrollArea,
-    QFrame,
     QTextEdit,
     QComboBox,
 )
@@ -23,6 +22,7 @@ from src.core.palette import ColorType, get_tag_color
 from src.core.constants import TAG_COLORS
 from src.qt.widgets.panel import PanelWidget, PanelModal
 from src.qt.widgets.tag import TagWidget
+from src.qt.helpers.scroll_area import make_scroll_area
 from src.qt.modals.tag_search import TagSearchPanel
 
 
@@ -30,7 +30,21 @@ ERROR = f"[ERROR]"
 WARNING = f"[WARNING]"
 INFO = f"[INFO]"
 
-logging.basicConfig(format="%(message)s", level=logging.INFO)
+LOGGER = logging.getLogger(__name__)
+
+# Color field entries, in the same order as TAG_COLORS.
+COLOR_ITEMS: list[str] = [color.title() for color in TAG_COLORS]
+
+
+@lru_cache(maxsize=64)
+def color_field_style(color: str) -> str:
+    """Returns the color combo box stylesheet for a lowercase tag color name."""
+    return (
+        f"combobox-popup:0;"
+        f"font-weight:600;"
+        f"color:{get_tag_color(ColorType.TEXT, color)};"
+        f"background-color:{get_tag_color(ColorType.PRIMARY, color)};"
+    )
 
 
 class BuildTagPanel(PanelWidget):
@@ -104,22 +118,25 @@ class BuildTagPanel(PanelWidget):
         self.scroll_layout.setContentsMargins(6, 0, 6, 0)
         self.scroll_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
-        self.scroll_area = QScrollArea()
+        self.subtags_container = QWidget()
+        self.subtags_container_layout = QVBoxLayout(self.subtags_container)
+        self.subtags_container_layout.setContentsMargins(0, 0, 0, 0)
+        self.subtags_container_layout.setSpacing(3)
+        self.scroll_layout.addWidget(self.subtags_container)
+        # Subtag TagWidgets by Tag ID, in display order.
+        self.subtag_widgets: dict[int, TagWidget] = {}
+
+        self.scroll_area = make_scroll_area(self.scroll_contents)
         # self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShadow(QFrame.Shadow.Plain)
-        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        self.scroll_area.setWidget(self.scroll_contents)
         # self.scroll_area.setMinimumHeight(60)
 
         self.subtags_layout.addWidget(self.scroll_area)
 
         self.subtags_add_button = QPushButton()
         self.subtags_add_button.setText("+")
-        tsp = TagSearchPanel(self.lib)
-        tsp.tag_chosen.connect(lambda x: self.add_subtag_callback(x))
-        self.add_tag_modal = PanelModal(tsp, "Add Parent Tags", "Add Parent Tags")
-        self.subtags_add_button.clicked.connect(self.add_tag_modal.show)
+        # Built on the first click, as most edits never add a parent tag.
+        self.add_tag_modal: PanelModal | None = None
+        self.subtags_add_button.clicked.connect(self.show_add_tag_modal)
         self.subtags_layout.addWidget(self.subtags_add_button)
 
         # self.subtags_field = TagBoxWidget()
@@ -140,16 +157,9 @@ class BuildTagPanel(PanelWidget):
         self.color_field.setEditable(False)
         self.color_field.setMaxVisibleItems(10)
         self.color_field.setStyleSheet("combobox-popup:0;")
-        for color in TAG_COLORS:
-            self.color_field.addItem(color.title())
+        self.color_field.addItems(COLOR_ITEMS)
         # self.color_field.setProperty("appearance", "flat")
-        self.color_field.currentTextChanged.connect(
-            lambda c: self.color_field.setStyleSheet(f"""combobox-popup:0;									
-																					   font-weight:600;
-																					   color:{get_tag_color(ColorType.TEXT, c.lower())};
-																					   background-color:{get_tag_color(ColorType.PRIMARY, c.lower())};
-																					   """)
-        )
+        self.color_field.currentTextChanged.connect(self.set_color_style)
         self.color_layout.addWidget(self.color_field)
 
         # Add Widgets to Layout ================================================
@@ -166,43 +176,67 @@ class BuildTagPanel(PanelWidget):
             self.tag = Tag(-1, "New Tag", "", [], [], "")
         self.set_tag(self.tag)
 
+    @Slot(str)
+    def set_color_style(self, color: str):
+        self.color_field.setStyleSheet(color_field_style(color.lower()))
+
+    @Slot()
+    def show_add_tag_modal(self):
+        if self.add_tag_modal is None:
+            tsp = TagSearchPanel(self.lib)
+            tsp.tag_chosen.connect(self.add_subtag_callback)
+            self.add_tag_modal = PanelModal(tsp, "Add Parent Tags", "Add Parent Tags")
+        self.add_tag_modal.show()
+
+    @Slot(int)
     def add_subtag_callback(self, tag_id: int):
-        logging.info(f"adding {tag_id}")
+        LOGGER.info("adding %s", tag_id)
         # tag = self.lib.get_tag(self.tag_id)
         # TODO: Create a single way to update tags and refresh library data
         # new = self.build_tag()
         self.tag.add_subtag(tag_id)
         # self.tag = new
         # self.lib.update_tag(new)
-        self.set_subtags()
+        if tag_id not in self.subtag_widgets:
+            self.add_subtag_widget(self.lib.get_tag(tag_id))
         # self.on_edit.emit(self.build_tag())
 
+    @Slot(int)
     def remove_subtag_callback(self, tag_id: int):
-        logging.info(f"removing {tag_id}")
+        LOGGER.info("removing %s", tag_id)
         # tag = self.lib.get_tag(self.tag_id)
         # TODO: Create a single way to update tags and refresh library data
         # new = self.build_tag()
         self.tag.remove_subtag(tag_id)
         # self.tag = new
         # self.lib.update_tag(new)
-        self.set_subtags()
+        tw = self.subtag_widgets.pop(tag_id, None)
+        if tw is not None:
+            tw.setParent(None)
+            tw.deleteLater()
         # self.on_edit.emit(self.build_tag())
 
+    @Slot()
     def set_subtags(self):
-        while self.scroll_layout.itemAt(0):
-            self.scroll_layout.takeAt(0).widget().deleteLater()
-        logging.info(f"Setting {self.tag.subtag_ids}")
-        c = QWidget()
-        l = QVBoxLayout(c)
-        l.setContentsMargins(0, 0, 0, 0)
-        l.setSpacing(3)
-        for tag_id in self.tag.subtag_ids:
-            tw = TagWidget(self.lib, self.lib.get_tag(tag_id), False, True)
-            tw.on_remove.connect(
-                lambda checked=False, t=tag_id: self.remove_subtag_callback(t)
-            )
-            l.addWidget(tw)
-        self.scroll_layout.addWidget(c)
+        LOGGER.info("Setting %s", self.tag.subtag_ids)
+        subtags: list[Tag] = [
+            self.lib.get_tag(tag_id) for tag_id in self.tag.subtag_ids
+        ]
+        # Repaint once after every widget is added, rather than once per widget.
+        self.scroll_contents.setUpdatesEnabled(False)
+        for tw in self.subtag_widgets.values():
+            tw.setParent(None)
+            tw.deleteLater()
+        self.subtag_widgets.clear()
+        for tag in subtags:
+            self.add_subtag_widget(tag)
+        self.scroll_contents.setUpdatesEnabled(True)
+
+    def add_subtag_widget(self, tag: Tag):
+        tw = TagWidget(self.lib, tag, False, True)
+        tw.on_remove.connect(partial(self.remove_subtag_callback, tag.id))
+        self.subtags_container_layout.addWidget(tw)
+        self.subtag_widgets[tag.id] = tw
 
     def set_tag(self, tag: Tag):
         # tag = self.lib.get_tag(tag_id)
@@ -219,15 +253,18 @@ class BuildTagPanel(PanelWidget):
         # 	tag = self.lib.get_tag(self.tag_id)
         # else:
         # 	tag = Tag(-1, '', '', [], [], '')
+        # One alias per non-blank line, without duplicates, in the order given.
+        lines = map(str.strip, self.aliases_field.toPlainText().splitlines())
+        aliases: list[str] = list(dict.fromkeys(line for line in lines if line))
         new_tag: Tag = Tag(
             id=self.tag.id,
             name=self.name_field.text(),
             shorthand=self.shorthand_field.text(),
-            aliases=self.aliases_field.toPlainText().split("\n"),
+            aliases=aliases,
             subtags_ids=self.tag.subtag_ids,
-            color=self.color_field.currentText().lower(),
+            color=TAG_COLORS[self.color_field.currentIndex()],
         )
-        logging.info(f"built {new_tag}")
+        LOGGER.info("built %s", new_tag)
         return new_tag
 
         # NOTE: The callback and signal do the same thing, I'm currently
@@ -2,24 +2,29 @@
 # Licensed under the GPL-3.0 License.
 # Created for TagStudio: https://github.com/CyanVoxel/TagStudio
 
-from PySide6.QtCore import Signal, Qt, QSize
+import logging
+from functools import partial
+
+from PySide6.QtCore import Signal, Slot, Qt, QSize, QThreadPool
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QHBoxLayout,
     QLineEdit,
-    QScrollArea,
-    QFrame,
 )
 
-from src.core.library import Library
+from src.core.library import Library, Tag
 from src.qt.widgets.panel import PanelWidget, PanelModal
 from src.qt.widgets.tag import TagWidget
+from src.qt.helpers.custom_runnable import CustomRunnable
+from src.qt.helpers.scroll_area import make_scroll_area
+from src.qt.helpers.search_list import RowPool, SearchDebouncer
 from src.qt.modals.build_tag import BuildTagPanel
 
 
 class TagDatabasePanel(PanelWidget):
     tag_chosen = Signal(int)
+    # Search number and matching tag IDs, sent from the search worker thread.
+    search_done = Signal(int, list)
 
     def __init__(self, library):
         super().__init__()
@@ -27,6 +32,8 @@ class TagDatabasePanel(PanelWidget):
         # self.callback = callback
         self.first_tag_id = -1
         self.tag_limit = 30
+        # Incremented per search, so results of an outdated search can be ignored.
+        self.search_count = 0
         # self.selected_tag: int = 0
 
         self.setMinimumSize(300, 400)
@@ -37,9 +44,8 @@ class TagDatabasePanel(PanelWidget):
         self.search_field.setObjectName("searchField")
         self.search_field.setMinimumSize(QSize(0, 32))
         self.search_field.setPlaceholderText("Search Tags")
-        self.search_field.textEdited.connect(
-            lambda x=self.search_field.text(): self.update_tags(x)
-        )
+        self.search_debouncer = SearchDebouncer(self.search_field, self.update_tags)
+        self.search_done.connect(self.show_search_results)
         self.search_field.returnPressed.connect(
             lambda checked=False: self.on_return(self.search_field.text())
         )
@@ -50,19 +56,27 @@ class TagDatabasePanel(PanelWidget):
         self.scroll_contents = QWidget()
         self.scroll_layout = QVBoxLayout(self.scroll_contents)
         self.scroll_layout.setContentsMargins(6, 0, 6, 0)
+        self.scroll_layout.setSpacing(3)
         self.scroll_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        # Rows kept between searches and reused for different tags.
+        self.tag_rows: RowPool[TagWidget, Tag] = RowPool(
+            self.scroll_contents, self.scroll_layout, self.make_tag_row
+        )
 
-        self.scroll_area = QScrollArea()
+        self.scroll_area = make_scroll_area(self.scroll_contents)
         # self.scroll_area.setStyleSheet('background: #000000;')
         self.scroll_area.setVerticalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAlwaysOn
         )
         # self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShadow(QFrame.Shadow.Plain)
-        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
         # sa.setMaximumWidth(self.preview_size[0])
-        self.scroll_area.setWidget(self.scroll_contents)
+        # Without a query, tags are listed a page at a time as the list is scrolled,
+        # or until the list is tall enough to scroll.
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.show_more_tags)
+        scroll_bar.rangeChanged.connect(
+            lambda minimum, maximum: self.show_more_tags(scroll_bar.value())
+        )
 
         # self.add_button = QPushButton()
         # self.root_layout.addWidget(self.add_button)
@@ -80,7 +94,9 @@ class TagDatabasePanel(PanelWidget):
     # 	self.update_tags('')
     # 	self.search_field.setFocus()
 
+    @Slot(str)
     def on_return(self, text: str):
+        self.search_debouncer.cancel()
         if text and self.first_tag_id >= 0:
             # callback(self.first_tag_id)
             self.search_field.setText("")
@@ -89,38 +105,73 @@ class TagDatabasePanel(PanelWidget):
             self.search_field.setFocus()
             self.parentWidget().hide()
 
+    @Slot(str)
     def update_tags(self, query: str):
-        # TODO: Look at recycling rather than deleting and reinitializing
-        while self.scroll_layout.itemAt(0):
-            self.scroll_layout.takeAt(0).widget().deleteLater()
-
-        # If there is a query, get a list of tag_ids that match, otherwise return all
+        self.search_debouncer.last_query = query
+        self.search_count += 1
+        # If there is a query, search for matching tags off of the UI thread,
+        # otherwise show the first page of all tags.
         if query:
-            tags = self.lib.search_tags(query, include_cluster=True)[
-                : self.tag_limit - 1
-            ]
+            r = CustomRunnable(partial(self.search_tag_ids, query, self.search_count))
+            QThreadPool.globalInstance().start(r)
         else:
-            # Get tag ids to keep this behaviorally identical
-            tags = [t.id for t in self.lib.tags]
-
-        first_id_set = False
-        for tag_id in tags:
-            if not first_id_set:
-                self.first_tag_id = tag_id
-                first_id_set = True
-            container = QWidget()
-            row = QHBoxLayout(container)
-            row.setContentsMargins(0, 0, 0, 0)
-            row.setSpacing(3)
-            tw = TagWidget(self.lib, self.lib.get_tag(tag_id), True, False)
-            tw.on_edit.connect(
-                lambda checked=False, t=self.lib.get_tag(tag_id): (self.edit_tag(t.id))
-            )
-            row.addWidget(tw)
-            self.scroll_layout.addWidget(container)
+            self.show_tags(self.lib.tags[: self.tag_limit])
 
         self.search_field.setFocus()
 
+    def search_tag_ids(self, query: str, search_count: int):
+        """Searches for tags on a worker thread and emits search_done with the IDs."""
+        tag_ids: list[int] = []
+        try:
+            tag_ids = self.lib.search_tags(
+                query, include_cluster=True, limit=self.tag_limit
+            )
+        except Exception:
+            logging.exception(f"[TAG DATABASE] Tag search failed for '{query}'")
+        # Always emit, so a failed search still replaces the previous results.
+        self.search_done.emit(search_count, tag_ids)
+
+    @Slot(int, list)
+    def show_search_results(self, search_count: int, tag_ids: list[int]):
+        # Only show the results of the latest search.
+        if search_count != self.search_count:
+            return
+        tags: list[Tag] = []
+        for tag_id in tag_ids:
+            # Skip tags removed since the search ran.
+            try:
+                tags.append(self.lib.get_tag(tag_id))
+            except KeyError:
+                continue
+        self.show_tags(tags)
+
+    def show_tags(self, tags: list[Tag]):
+        self.first_tag_id = tags[0].id if tags else -1
+        self.tag_rows.show(tags, TagWidget.set_tag)
+
+    @Slot(int)
+    def show_more_tags(self, scroll_value: int):
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if (
+            self.search_debouncer.last_query
+            or scroll_value < scroll_bar.maximum() - scroll_bar.pageStep()
+            or self.tag_rows.shown_count >= len(self.lib.tags)
+        ):
+            return
+        start = self.tag_rows.shown_count
+        self.tag_rows.show(
+            self.lib.tags[start : start + self.tag_limit], TagWidget.set_tag, start
+        )
+
+    def make_tag_row(self, tag: Tag) -> tuple[TagWidget, TagWidget]:
+        tw = TagWidget(self.lib, tag, True, False)
+        tw.on_edit.connect(partial(self.edit_tag_of_widget, tw))
+        return tw, tw
+
+    def edit_tag_of_widget(self, tw: TagWidget):
+        self.edit_tag(tw.tag.id)
+
+    @Slot(int)
     def edit_tag(self, tag_id: int):
         btp = BuildTagPanel(self.lib, tag_id)
         # btp.on_edit.connect(lambda x: self.edit_tag_callback(x))
@@ -128,12 +179,11 @@ class TagDatabasePanel(PanelWidget):
             btp,
             self.lib.get_tag(tag_id).display_name(self.lib),
             "Edit Tag",
-            done_callback=(self.update_tags(self.search_field.text())),
             has_save=True,
         )
         # self.edit_modal.widget.update_display_name.connect(lambda t: self.edit_modal.title_widget.setText(t))
         # TODO Check Warning: Expected type 'BuildTagPanel', got 'PanelWidget' instead
-        self.edit_modal.saved.connect(lambda: self.edit_tag_callback(btp))
+        self.edit_modal.saved.connect(partial(self.edit_tag_callback, btp))
         self.edit_modal.show()
 
     def edit_tag_callback(self, btp: BuildTagPanel):
@@ -5,22 +5,23 @@
 
 import logging
 import math
+from functools import lru_cache, partial
 
-from PySide6.QtCore import Signal, Qt, QSize
+from PySide6.QtCore import Signal, Slot, Qt, QSize, QTimer
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QPushButton,
     QLineEdit,
-    QScrollArea,
-    QFrame,
 )
 
-from src.core.library import Library
+from src.core.library import Library, Tag
 from src.core.palette import ColorType, get_tag_color
 from src.qt.widgets.panel import PanelWidget
 from src.qt.widgets.tag import TagWidget
+from src.qt.helpers.scroll_area import make_scroll_area
+from src.qt.helpers.search_list import RowPool, SearchDebouncer
 
 
 ERROR = f"[ERROR]"
@@ -29,6 +30,38 @@ INFO = f"[INFO]"
 
 logging.basicConfig(format="%(message)s", level=logging.INFO)
 
+SEARCH_FIELD_MIN_SIZE = QSize(0, 32)
+ADD_BUTTON_SIZE = QSize(23, 23)
+
+
+@lru_cache(maxsize=64)
+def add_button_style(color: str, border_width: int) -> str:
+    """Returns the stylesheet for a tag's add button, given its color name."""
+    return (
+        f"QPushButton{{"
+        f"background: {get_tag_color(ColorType.PRIMARY, color)};"
+        # f'background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {get_tag_color(ColorType.PRIMARY, color)}, stop:1.0 {get_tag_color(ColorType.BORDER, color)});'
+        # f"border-color:{get_tag_color(ColorType.PRIMARY, color)};"
+        f"color: {get_tag_color(ColorType.TEXT, color)};"
+        f"font-weight: 600;"
+        f"border-color:{get_tag_color(ColorType.BORDER, color)};"
+        f"border-radius: 6px;"
+        f"border-style:solid;"
+        f"border-width: {border_width}px;"
+        # f'padding-top: 1.5px;'
+        # f'padding-right: 4px;'
+        f"padding-bottom: 5px;"
+        # f'padding-left: 4px;'
+        f"font-size: 20px;"
+        f"}}"
+        f"QPushButton::hover"
+        f"{{"
+        f"border-color:{get_tag_color(ColorType.LIGHT_ACCENT, color)};"
+        f"color: {get_tag_color(ColorType.DARK_ACCENT, color)};"
+        f"background: {get_tag_color(ColorType.LIGHT_ACCENT, color)};"
+        f"}}"
+    )
+
 
 class TagSearchPanel(PanelWidget):
     tag_chosen = Signal(int)
@@ -46,14 +79,12 @@ class TagSearchPanel(PanelWidget):
 
         self.search_field = QLineEdit()
         self.search_field.setObjectName("searchField")
-        self.search_field.setMinimumSize(QSize(0, 32))
+        self.search_field.setMinimumSize(SEARCH_FIELD_MIN_SIZE)
         self.search_field.setPlaceholderText("Search Tags")
-        self.search_field.textEdited.connect(
-            lambda x=self.search_field.text(): self.update_tags(x)
-        )
-        self.search_field.returnPressed.connect(
-            lambda checked=False: self.on_return(self.search_field.text())
+        self.search_debouncer = SearchDebouncer(
+            self.search_field, partial(self.update_tags, changed_only=True)
         )
+        self.search_field.returnPressed.connect(self.on_return_pressed)
 
         # self.content_container = QWidget()
         # self.content_layout = QHBoxLayout(self.content_container)
@@ -62,18 +93,18 @@ class TagSearchPanel(PanelWidget):
         self.scroll_layout = QVBoxLayout(self.scroll_contents)
         self.scroll_layout.setContentsMargins(6, 0, 6, 0)
         self.scroll_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        # Rows kept between searches and reused for different tags.
+        self.tag_rows: RowPool[tuple[TagWidget, QPushButton], Tag] = RowPool(
+            self.scroll_contents, self.scroll_layout, self.make_tag_row
+        )
 
-        self.scroll_area = QScrollArea()
+        self.scroll_area = make_scroll_area(self.scroll_contents)
         # self.scroll_area.setStyleSheet('background: #000000;')
         self.scroll_area.setVerticalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAlwaysOn
         )
         # self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShadow(QFrame.Shadow.Plain)
-        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
         # sa.setMaximumWidth(self.preview_size[0])
-        self.scroll_area.setWidget(self.scroll_contents)
 
         # self.add_button = QPushButton()
         # self.root_layout.addWidget(self.add_button)
@@ -90,71 +121,77 @@ class TagSearchPanel(PanelWidget):
     # 	self.update_tags('')
     # 	self.search_field.setFocus()
 
+    @Slot()
+    def on_return_pressed(self):
+        self.on_return(self.search_field.text())
+
+    @Slot(str)
     def on_return(self, text: str):
+        # Search right away if typing hasn't paused yet, so Enter picks the
+        # first result for the text that is actually in the field.
+        if self.search_debouncer.cancel():
+            if text != self.search_debouncer.last_query:
+                self.update_tags(text, changed_only=True)
         if text and self.first_tag_id is not None:
             # callback(self.first_tag_id)
             self.tag_chosen.emit(self.first_tag_id)
             self.search_field.setText("")
-            self.update_tags()
+            # Show the unfiltered list once control returns to the event loop,
+            # rather than delaying the end of the Enter key press.
+            QTimer.singleShot(0, self.update_tags)
         else:
             self.search_field.setFocus()
             self.parentWidget().hide()
 
-    def update_tags(self, query: str = ""):
-        # for c in self.scroll_layout.children():
-        # 	c.widget().deleteLater()
-        while self.scroll_layout.count():
-            # logging.info(f"I'm deleting { self.scroll_layout.itemAt(0).widget()}")
-            self.scroll_layout.takeAt(0).widget().deleteLater()
-
-        found_tags = self.lib.search_tags(query, include_cluster=True)[
-            : self.tag_limit - 1
-        ]
+    def update_tags(self, query: str = "", changed_only: bool = False):
+        # While typing, rows already showing the right Tag are left as they are.
+        # Other callers refresh every row, in case a Tag was edited since.
+        self.search_debouncer.last_query = query
+        found_tags = self.lib.search_tags(
+            query, include_cluster=True, limit=self.tag_limit
+        )
         self.first_tag_id = found_tags[0] if found_tags else None
 
-        for tag_id in found_tags:
-            c = QWidget()
-            l = QHBoxLayout(c)
-            l.setContentsMargins(0, 0, 0, 0)
-            l.setSpacing(3)
-            tw = TagWidget(self.lib, self.lib.get_tag(tag_id), False, False)
-            ab = QPushButton()
-            ab.setMinimumSize(23, 23)
-            ab.setMaximumSize(23, 23)
-            ab.setText("+")
-            ab.setStyleSheet(
-                f"QPushButton{{"
-                f"background: {get_tag_color(ColorType.PRIMARY, self.lib.get_tag(tag_id).color)};"
-                # f'background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {get_tag_color(ColorType.PRIMARY, tag.color)}, stop:1.0 {get_tag_color(ColorType.BORDER, tag.color)});'
-                # f"border-color:{get_tag_color(ColorType.PRIMARY, tag.color)};"
-                f"color: {get_tag_color(ColorType.TEXT, self.lib.get_tag(tag_id).color)};"
-                f"font-weight: 600;"
-                f"border-color:{get_tag_color(ColorType.BORDER, self.lib.get_tag(tag_id).color)};"
-                f"border-radius: 6px;"
-                f"border-style:solid;"
-                f"border-width: {math.ceil(1*self.devicePixelRatio())}px;"
-                # f'padding-top: 1.5px;'
-                # f'padding-right: 4px;'
-                f"padding-bottom: 5px;"
-                # f'padding-left: 4px;'
-                f"font-size: 20px;"
-                f"}}"
-                f"QPushButton::hover"
-                f"{{"
-                f"border-color:{get_tag_color(ColorType.LIGHT_ACCENT, self.lib.get_tag(tag_id).color)};"
-                f"color: {get_tag_color(ColorType.DARK_ACCENT, self.lib.get_tag(tag_id).color)};"
-                f"background: {get_tag_color(ColorType.LIGHT_ACCENT, self.lib.get_tag(tag_id).color)};"
-                f"}}"
-            )
-
-            ab.clicked.connect(lambda checked=False, x=tag_id: self.tag_chosen.emit(x))
-
-            l.addWidget(tw)
-            l.addWidget(ab)
-            self.scroll_layout.addWidget(c)
+        self.tag_rows.show(
+            [self.lib.get_tag(tag_id) for tag_id in found_tags],
+            partial(self.set_tag_row, changed_only=changed_only),
+        )
 
         self.search_field.setFocus()
 
+    def make_tag_row(self, tag: Tag) -> tuple[QWidget, tuple[TagWidget, QPushButton]]:
+        c = QWidget()
+        l = QHBoxLayout(c)
+        l.setContentsMargins(0, 0, 0, 0)
+        l.setSpacing(3)
+        tw = TagWidget(self.lib, tag, False, False)
+        ab = QPushButton()
+        ab.setFixedSize(ADD_BUTTON_SIZE)
+        ab.setText("+")
+        ab.clicked.connect(partial(self.choose_tag_of_widget, tw))
+        l.addWidget(tw)
+        l.addWidget(ab)
+        self.set_add_button_style(ab, tag)
+        return c, (tw, ab)
+
+    def set_tag_row(
+        self, row: tuple[TagWidget, QPushButton], tag: Tag, changed_only: bool = False
+    ):
+        """Shows a Tag in a reused row."""
+        tw, ab = row
+        if changed_only and tw.tag is tag:
+            return
+        tw.set_tag(tag)
+        self.set_add_button_style(ab, tag)
+
+    def set_add_button_style(self, ab: QPushButton, tag: Tag):
+        ab.setStyleSheet(
+            add_button_style(tag.color, math.ceil(1 * self.devicePixelRatio()))
+        )
+
+    def choose_tag_of_widget(self, tw: TagWidget):
+        self.tag_chosen.emit(tw.tag.id)
+
     # def enterEvent(self, event: QEnterEvent) -> None:
     # 	self.search_field.setFocus()
     # 	return super().enterEvent(event)
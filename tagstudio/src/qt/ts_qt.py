@@ -21,10 +21,20 @@ from queue import Queue
 from typing import Optional
 from PIL import Image
 from PySide6 import QtCore
-from PySide6.QtCore import QObject, QThread, Signal, Qt, QThreadPool, QTimer, QSettings
+from PySide6.QtCore import (
+    QObject,
+    QThread,
+    Signal,
+    Qt,
+    QThreadPool,
+    QTimer,
+    QSettings,
+    QSize,
+)
 from PySide6.QtGui import (
     QGuiApplication,
     QPixmap,
+    QPixmapCache,
     QMouseEvent,
     QColor,
     QAction,
@@ -552,6 +562,8 @@ class QtDriver(QObject):
 
     def init_library_window(self):
         self._init_thumb_grid()
+        # Keeps up to 128 MiB of rendered thumbnails for pages that are revisited.
+        QPixmapCache.setCacheLimit(128 * 1024)
 
         # TODO: Put this into its own method that copies the font file(s) into memory
         # so the resource isn't being used, then store the specific size variations
@@ -681,6 +693,7 @@ class QtDriver(QObject):
             self.settings.sync()
 
             self.lib.clear_internal_vars()
+            QPixmapCache.clear()
             title_text = f"{self.base_title}"
             self.main_window.setWindowTitle(title_text)
 
@@ -786,6 +799,8 @@ class QtDriver(QObject):
         # # self.main_window.statusbar.showMessage('', 3)
         # # self.filter_entries('')
 
+        # Render thumbnails again, in case their files have changed.
+        QPixmapCache.clear()
         iterator = FunctionIterator(self.lib.refresh_dir)
         pw = ProgressWidget(
             window_title="Refreshing Directories",
@@ -1197,6 +1212,11 @@ class QtDriver(QObject):
 
         ratio: float = self.main_window.devicePixelRatio()
         base_size: tuple[int, int] = (self.thumb_size, self.thumb_size)
+        adj_size = math.ceil(self.thumb_size * ratio)
+        loading_jobs: list[tuple] = []
+        render_jobs: list[tuple] = []
+        # Thumbnails already rendered and still in the QPixmapCache, by index.
+        cached_thumbs: dict[int, QPixmap] = {}
 
         for i, item_thumb in enumerate(self.item_thumbs, start=0):
             if i < len(self.nav_frames[self.cur_frame_idx].contents):
@@ -1205,13 +1225,22 @@ class QtDriver(QObject):
                 item_thumb.set_mode(self.nav_frames[self.cur_frame_idx].contents[i][0])
                 item_thumb.ignore_size = False
                 # logging.info(f'[UPDATE] Set Mode To: {item.mode}')
-                # Set thumbnails to loading (will always finish if rendering)
-                self.thumb_job_queue.put(
-                    (
-                        item_thumb.renderer.render,
-                        (sys.float_info.max, "", base_size, ratio, True, True),
-                    )
+                item_thumb.thumb_cache_key = self.get_thumb_cache_key(
+                    self.nav_frames[self.cur_frame_idx].contents[i], adj_size, ratio
                 )
+                pixmap = QPixmap()
+                if item_thumb.thumb_cache_key and QPixmapCache.find(
+                    item_thumb.thumb_cache_key, pixmap
+                ):
+                    cached_thumbs[i] = pixmap
+                else:
+                    # Set thumbnails to loading (will always finish if rendering)
+                    loading_jobs.append(
+                        (
+                            item_thumb.renderer.render,
+                            (sys.float_info.max, "", base_size, ratio, True, True),
+                        )
+                    )
                 # # Restore Selected Borders
                 # if (item_thumb.mode, item_thumb.item_id) in self.selected:
                 # 	item_thumb.thumb_button.set_selected(True)
@@ -1223,6 +1252,8 @@ class QtDriver(QObject):
                 item_thumb.set_item_id(-1)
                 item_thumb.thumb_button.set_selected(False)
 
+        self.queue_thumb_batches(loading_jobs)
+
         # scrollbar: QScrollArea = self.main_window.scrollArea
         # scrollbar.verticalScrollBar().setValue(scrollbar_pos)
         self.flow_container.layout().update()
@@ -1300,12 +1331,25 @@ class QtDriver(QObject):
                 else:
                     item_thumb.thumb_button.set_selected(False)
 
-                self.thumb_job_queue.put(
-                    (
-                        item_thumb.renderer.render,
-                        (time.time(), filepath, base_size, ratio, False, True),
+                if i in cached_thumbs:
+                    pixmap = cached_thumbs[i]
+                    timestamp = time.time()
+                    item_thumb.update_thumb(timestamp, image=pixmap)
+                    item_thumb.update_size(
+                        timestamp,
+                        size=QSize(
+                            math.ceil(adj_size / ratio),
+                            math.ceil(pixmap.height() / ratio),
+                        ),
+                    )
+                    item_thumb.set_extension(filepath.suffix.lower())
+                else:
+                    render_jobs.append(
+                        (
+                            item_thumb.renderer.render,
+                            (time.time(), filepath, base_size, ratio, False, True),
+                        )
                     )
-                )
             else:
                 # item.setHidden(True)
                 pass
@@ -1313,10 +1357,53 @@ class QtDriver(QObject):
                 # self.thumb_job_queue.put(
                 # 	(item.renderer.render, ('', base_size, ratio, False)))
 
+        self.queue_thumb_batches(render_jobs)
+
         # end_time = time.time()
         # logging.info(
         # 	f'[MAIN] Elements thumbs updated in {(end_time - start_time):.3f} seconds')
 
+    def get_thumb_cache_key(
+        self, item: tuple[ItemType, int], adj_size: int, ratio: float
+    ) -> str | None:
+        """
+        Returns the QPixmapCache key for an Entry or Collation's thumbnail,
+        or None if it has no file to show. Keys are made from Entry IDs, so the
+        cache is cleared whenever the Library is opened, closed, or refreshed.
+        """
+        if item[0] == ItemType.ENTRY:
+            entry_id = item[1]
+        elif item[0] == ItemType.COLLATION:
+            collation = self.lib.get_collation(item[1])
+            entry_id = (
+                collation.cover_id
+                if collation.cover_id >= 0
+                else collation.e_ids_and_pages[0][0]
+            )
+        else:
+            return None
+        return f"{entry_id}|{adj_size}|{ratio}"
+
+    def queue_thumb_batches(self, jobs: list[tuple]):
+        """Queues thumbnail jobs as one batch per thread, rather than one job each."""
+        batch_time = time.time()
+        batch_size = math.ceil(len(jobs) / len(self.thumb_threads)) or 1
+        for i in range(0, len(jobs), batch_size):
+            self.thumb_job_queue.put(
+                (self.render_thumb_batch, (jobs[i : i + batch_size], batch_time))
+            )
+
+    def render_thumb_batch(self, jobs: list[tuple], timestamp: float):
+        """Runs a batch of thumbnail jobs, stopping early if the thumbnails update."""
+        for render, args in jobs:
+            if timestamp < ItemThumb.update_cutoff:
+                break
+            try:
+                render(*args)
+            except RuntimeError as e:
+                # Keep rendering the rest of the batch.
+                logging.error(f"[MAIN] Thumbnail render failed: {e}")
+
     def update_badges(self):
         for i, item_thumb in enumerate(self.item_thumbs, start=0):
             item_thumb.update_badges()
@@ -1426,6 +1513,7 @@ class QtDriver(QObject):
         if self.lib.library_dir:
             self.save_library()
             self.lib.clear_internal_vars()
+            QPixmapCache.clear()
 
         self.main_window.statusbar.showMessage(f"Opening Library {str(path)}", 3)
         return_code = self.lib.open_library(path)
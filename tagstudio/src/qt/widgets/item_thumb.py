@@ -5,6 +5,7 @@
 
 import logging
 import os
+import sys
 import time
 import typing
 from types import FunctionType
@@ -13,7 +14,7 @@ from typing import Optional
 
 from PIL import Image, ImageQt
 from PySide6.QtCore import Qt, QSize, QEvent
-from PySide6.QtGui import QPixmap, QEnterEvent, QAction
+from PySide6.QtGui import QPixmap, QPixmapCache, QEnterEvent, QAction
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -174,13 +175,11 @@ class ItemThumb(FlowWidget):
 
         self.thumb_button = ThumbButton(self, thumb_size)
         self.renderer = ThumbRenderer()
-        self.renderer.updated.connect(
-            lambda ts, i, s, ext: (
-                self.update_thumb(ts, image=i),
-                self.update_size(ts, size=s),
-                self.set_extension(ext),  # type: ignore
-            )
-        )
+        # QPixmapCache key for the thumbnail being rendered, or None to not cache it.
+        self.thumb_cache_key: str | None = None
+        # The update_cutoff in effect when a finished thumbnail was last shown.
+        self.thumb_cutoff: float | None = None
+        self.renderer.updated.connect(self.on_thumb_rendered)
         self.thumb_button.setFlat(True)
 
         # self.bg_button.setStyleSheet('background-color:blue;')
@@ -371,13 +370,41 @@ class ItemThumb(FlowWidget):
                 self.ext_badge.setHidden(True)
                 self.count_badge.setHidden(True)
 
+    def on_thumb_rendered(
+        self, timestamp: float, image: QPixmap, size: QSize, ext: str
+    ):
+        """Shows a thumbnail sent by the ThumbRenderer."""
+        # Loading thumbnails are sent with the maximum timestamp, so one still
+        # queued from an earlier page could replace a finished thumbnail.
+        if (
+            timestamp == sys.float_info.max
+            and self.thumb_cutoff == ItemThumb.update_cutoff
+        ):
+            return
+        self.update_thumb(timestamp, image=image)
+        self.update_size(timestamp, size=size)
+        self.set_extension(ext)
+        self.cache_thumb(timestamp, image=image)
+
     def update_thumb(self, timestamp: float, image: QPixmap = None):
         """Updates attributes of a thumbnail element."""
         # logging.info(f'[GUI] Updating Thumbnail for element {id(element)}: {id(image) if image else None}')
         if timestamp > ItemThumb.update_cutoff:
             self.thumb_button.setIcon(image if image else QPixmap())
+            if timestamp < sys.float_info.max:
+                self.thumb_cutoff = ItemThumb.update_cutoff
             # element.repaint()
 
+    def cache_thumb(self, timestamp: float, image: QPixmap):
+        """Stores a finished thumbnail render in the QPixmapCache."""
+        # Loading thumbnails are sent with the maximum timestamp.
+        if (
+            self.thumb_cache_key
+            and image
+            and ItemThumb.update_cutoff < timestamp < sys.float_info.max
+        ):
+            QPixmapCache.insert(self.thumb_cache_key, image)
+
     def update_size(self, timestamp: float, size: QSize):
         """Updates attributes of a thumbnail element."""
         # logging.info(f'[GUI] Updating size for element {id(element)}:  {size.__str__()}')
@@ -57,7 +57,6 @@ class TagWidget(QWidget):
 
         self.bg_button = QPushButton(self)
         self.bg_button.setFlat(True)
-        self.bg_button.setText(tag.display_name(self.lib).replace("&", "&&"))
         if has_edit:
             edit_action = QAction("Edit", self)
             edit_action.triggered.connect(on_edit_callback)
@@ -95,37 +94,6 @@ class TagWidget(QWidget):
         # 	f'background-color: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,stop: 0 {ColorType.PRIMARY}, stop: 1 {ColorType.BORDER});'
         # 	f'min-width: 80px;}}')
 
-        self.bg_button.setStyleSheet(
-            # f'background: {get_tag_color(ColorType.PRIMARY, tag.color)};'
-            f"QPushButton{{"
-            f"background: {get_tag_color(ColorType.PRIMARY, tag.color)};"
-            # f'background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {get_tag_color(ColorType.PRIMARY, tag.color)}, stop:1.0 {get_tag_color(ColorType.BORDER, tag.color)});'
-            # f"border-color:{get_tag_color(ColorType.PRIMARY, tag.color)};"
-            f"color: {get_tag_color(ColorType.TEXT, tag.color)};"
-            f"font-weight: 600;"
-            f"border-color:{get_tag_color(ColorType.BORDER, tag.color)};"
-            f"border-radius: 6px;"
-            f"border-style:solid;"
-            f"border-width: {math.ceil(1*self.devicePixelRatio())}px;"
-            # f'border-top:2px solid {get_tag_color(ColorType.LIGHT_ACCENT, tag.color)};'
-            # f'border-bottom:2px solid {get_tag_color(ColorType.BORDER, tag.color)};'
-            # f'border-left:2px solid {get_tag_color(ColorType.BORDER, tag.color)};'
-            # f'border-right:2px solid {get_tag_color(ColorType.BORDER, tag.color)};'
-            # f'padding-top: 0.5px;'
-            f"padding-right: 4px;"
-            f"padding-bottom: 1px;"
-            f"padding-left: 4px;"
-            f"font-size: 13px"
-            f"}}"
-            f"QPushButton::hover{{"
-            # f'background: {get_tag_color(ColorType.LIGHT_ACCENT, tag.color)};'
-            # f'background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {get_tag_color(ColorType.PRIMARY, tag.color)}, stop:1.0 {get_tag_color(ColorType.BORDER, tag.color)});'
-            # f"border-color:{get_tag_color(ColorType.PRIMARY, tag.color)};"
-            # f"color: {get_tag_color(ColorType.TEXT, tag.color)};"
-            f"border-color:{get_tag_color(ColorType.LIGHT_ACCENT, tag.color)};"
-            f"}}"
-        )
-
         # self.renderer = ThumbRenderer()
         # self.renderer.updated.connect(lambda ts, i, s, ext: (self.update_thumb(ts, image=i),
         # 													 self.update_size(
@@ -143,25 +111,6 @@ class TagWidget(QWidget):
             self.remove_button.setFlat(True)
             self.remove_button.setText("–")
             self.remove_button.setHidden(True)
-            self.remove_button.setStyleSheet(
-                f"color: {get_tag_color(ColorType.PRIMARY, tag.color)};"
-                f"background: {get_tag_color(ColorType.TEXT, tag.color)};"
-                # f"color: {'black' if color not in ['black', 'gray', 'dark gray', 'cool gray', 'warm gray', 'blue', 'purple', 'violet'] else 'white'};"
-                # f"border-color: {get_tag_color(ColorType.BORDER, tag.color)};"
-                f"font-weight: 800;"
-                # f"border-color:{'black' if color not in [
-                # 'black', 'gray', 'dark gray',
-                # 'cool gray', 'warm gray', 'blue',
-                # 'purple', 'violet'] else 'white'};"
-                f"border-radius: 4px;"
-                # f'border-style:solid;'
-                f"border-width:0;"
-                # f'padding-top: 1.5px;'
-                # f'padding-right: 4px;'
-                f"padding-bottom: 4px;"
-                # f'padding-left: 4px;'
-                f"font-size: 14px"
-            )
             self.remove_button.setMinimumSize(19, 19)
             self.remove_button.setMaximumSize(19, 19)
             # self.remove_button.clicked.connect(on_remove_callback)
@@ -209,6 +158,63 @@ class TagWidget(QWidget):
 
         # self.setMinimumSize(50,20)
 
+        self.set_tag(tag)
+
+    def set_tag(self, tag: Tag) -> None:
+        """Displays a Tag, so the widget can be reused for a different Tag."""
+        self.tag = tag
+        self.bg_button.setText(tag.display_name(self.lib).replace("&", "&&"))
+        self.bg_button.setStyleSheet(
+            # f'background: {get_tag_color(ColorType.PRIMARY, tag.color)};'
+            f"QPushButton{{"
+            f"background: {get_tag_color(ColorType.PRIMARY, tag.color)};"
+            # f'background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {get_tag_color(ColorType.PRIMARY, tag.color)}, stop:1.0 {get_tag_color(ColorType.BORDER, tag.color)});'
+            # f"border-color:{get_tag_color(ColorType.PRIMARY, tag.color)};"
+            f"color: {get_tag_color(ColorType.TEXT, tag.color)};"
+            f"font-weight: 600;"
+            f"border-color:{get_tag_color(ColorType.BORDER, tag.color)};"
+            f"border-radius: 6px;"
+            f"border-style:solid;"
+            f"border-width: {math.ceil(1*self.devicePixelRatio())}px;"
+            # f'border-top:2px solid {get_tag_color(ColorType.LIGHT_ACCENT, tag.color)};'
+            # f'border-bottom:2px solid {get_tag_color(ColorType.BORDER, tag.color)};'
+            # f'border-left:2px solid {get_tag_color(ColorType.BORDER, tag.color)};'
+            # f'border-right:2px solid {get_tag_color(ColorType.BORDER, tag.color)};'
+            # f'padding-top: 0.5px;'
+            f"padding-right: 4px;"
+            f"padding-bottom: 1px;"
+            f"padding-left: 4px;"
+            f"font-size: 13px"
+            f"}}"
+            f"QPushButton::hover{{"
+            # f'background: {get_tag_color(ColorType.LIGHT_ACCENT, tag.color)};'
+            # f'background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {get_tag_color(ColorType.PRIMARY, tag.color)}, stop:1.0 {get_tag_color(ColorType.BORDER, tag.color)});'
+            # f"border-color:{get_tag_color(ColorType.PRIMARY, tag.color)};"
+            # f"color: {get_tag_color(ColorType.TEXT, tag.color)};"
+            f"border-color:{get_tag_color(ColorType.LIGHT_ACCENT, tag.color)};"
+            f"}}"
+        )
+        if self.has_remove:
+            self.remove_button.setStyleSheet(
+                f"color: {get_tag_color(ColorType.PRIMARY, tag.color)};"
+                f"background: {get_tag_color(ColorType.TEXT, tag.color)};"
+                # f"color: {'black' if color not in ['black', 'gray', 'dark gray', 'cool gray', 'warm gray', 'blue', 'purple', 'violet'] else 'white'};"
+                # f"border-color: {get_tag_color(ColorType.BORDER, tag.color)};"
+                f"font-weight: 800;"
+                # f"border-color:{'black' if color not in [
+                # 'black', 'gray', 'dark gray',
+                # 'cool gray', 'warm gray', 'blue',
+                # 'purple', 'violet'] else 'white'};"
+                f"border-radius: 4px;"
+                # f'border-style:solid;'
+                f"border-width:0;"
+                # f'padding-top: 1.5px;'
+                # f'padding-right: 4px;'
+                f"padding-bottom: 4px;"
+                # f'padding-left: 4px;'
+                f"font-size: 14px"
+            )
+
     # def set_name(self, name:str):
     # 	self.bg_label.setText(str)
 
@@ -3,6 +3,7 @@
 # Created for TagStudio: https://github.com/CyanVoxel/TagStudio
 
 
+import functools
 import logging
 import math
 from pathlib import Path
@@ -42,6 +43,15 @@ register_heif_opener()
 register_avif_opener()
 
 
+@functools.lru_cache(maxsize=64)
+def resized_asset(name: str, size: int, resample: Image.Resampling) -> Image.Image:
+    """
+    Returns one of ThumbRenderer's 512px images, by attribute name, resized to a square.
+    The result is cached and shared between renders, so don't modify or close it.
+    """
+    return getattr(ThumbRenderer, name).resize((size, size), resample=resample)
+
+
 class ThumbRenderer(QObject):
     # finished = Signal()
     updated = Signal(float, QPixmap, QSize, str)
@@ -110,8 +120,8 @@ class ThumbRenderer(QObject):
 
         adj_size = math.ceil(max(base_size[0], base_size[1]) * pixel_ratio)
         if is_loading:
-            final = ThumbRenderer.thumb_loading_512.resize(
-                (adj_size, adj_size), resample=Image.Resampling.BILINEAR
+            final = resized_asset(
+                "thumb_loading_512", adj_size, Image.Resampling.BILINEAR
             )
             qim = ImageQt.ImageQt(final)
             pixmap = QPixmap.fromImage(qim)
@@ -124,6 +134,9 @@ class ThumbRenderer(QObject):
                 if _filepath.suffix.lower() in IMAGE_TYPES:
                     try:
                         image = Image.open(_filepath)
+                        # Lets JPEGs decode at a reduced scale that is still
+                        # at least the thumbnail size, instead of in full.
+                        image.draft("RGB", (adj_size, adj_size))
                         if image.mode != "RGB" and image.mode != "RGBA":
                             image = image.convert(mode="RGBA")
                         if image.mode == "RGBA":
@@ -232,13 +245,17 @@ class ThumbRenderer(QObject):
                     < max(base_size[0], base_size[1])
                     else Image.Resampling.BILINEAR
                 )
-                image = image.resize((new_x, new_y), resample=resampling_method)
+                # Shrinks large images with a quick integer reduce() first,
+                # so the resampling filter only runs over a small image.
+                image = image.resize(
+                    (new_x, new_y), resample=resampling_method, reducing_gap=3.0
+                )
                 if gradient:
-                    mask: Image.Image = ThumbRenderer.thumb_mask_512.resize(
-                        (adj_size, adj_size), resample=Image.Resampling.BILINEAR
+                    mask: Image.Image = resized_asset(
+                        "thumb_mask_512", adj_size, Image.Resampling.BILINEAR
                     ).getchannel(3)
-                    hl: Image.Image = ThumbRenderer.thumb_mask_hl_512.resize(
-                        (adj_size, adj_size), resample=Image.Resampling.BILINEAR
+                    hl: Image.Image = resized_asset(
+                        "thumb_mask_hl_512", adj_size, Image.Resampling.BILINEAR
                     )
                     final = four_corner_gradient_background(image, adj_size, mask, hl)
                 else:
@@ -273,9 +290,7 @@ class ThumbRenderer(QObject):
                     )
                 if update_on_ratio_change:
                     self.updated_ratio.emit(1)
-                final = ThumbRenderer.thumb_broken_512.resize(
-                    (adj_size, adj_size), resample=resampling_method
-                )
+                final = resized_asset("thumb_broken_512", adj_size, resampling_method)
             qim = ImageQt.ImageQt(final)
             if image:
                 image.close()
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.alt_core.library import Library
+from src.database.table_declarations.tag import TagAlias
+
+
+def test_create_library_adds_default_tags(tmp_path: Path):
+    lib = Library()
+    assert lib.create_library(tmp_path)
+
+    assert lib.archived_tag.name == "Archived"
+    assert lib.favorite_tag.name == "Favorite"
+    with Session(lib.engine) as session:
+        aliases = set(session.scalars(select(TagAlias.name)))
+    assert aliases == {"Archive", "Favorited", "Favorites"}
+
+
+def test_open_library_keeps_default_tags(tmp_path: Path):
+    assert Library().create_library(tmp_path)
+
+    lib = Library()
+    assert lib.open_library(tmp_path)
+    assert lib.archived_tag.name == "Archived"
+    assert lib.favorite_tag.name == "Favorite"
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from src.alt_core.library import Library
+
+
+@pytest.fixture
+def lib(tmp_path: Path):
+    lib = Library()
+    assert lib.create_library(tmp_path)
+    return lib
+
+
+def add_files(root: Path, count: int):
+    for i in range(count):
+        (root / f"{i}.txt").touch()
+
+
+def test_refresh_dir_adds_new_files(lib):
+    add_files(lib.root_path, 3)
+
+    assert list(lib.refresh_dir()) == [3]
+    assert sorted(str(e.path) for e in lib.entries) == ["0.txt", "1.txt", "2.txt"]
+
+
+def test_refresh_dir_keeps_batches_when_stopped_early(lib):
+    add_files(lib.root_path, 1500)
+
+    progress = lib.refresh_dir()
+    # Stop once the first batch of 1000 Entries has been committed.
+    for count in progress:
+        if count > 1000:
+            break
+    progress.close()
+
+    assert len(lib.entries) == 1000
+
+
+def test_refresh_dir_yields_final_count(lib):
+    add_files(lib.root_path, 300)
+
+    assert list(lib.refresh_dir()) == [256, 300]
+
+
+def test_missing_files_not_duplicated(lib):
+    add_files(lib.root_path, 3)
+    list(lib.refresh_dir())
+    (lib.root_path / "1.txt").unlink()
+    expected = [str(lib.root_path / "1.txt")]
+
+    list(lib.refresh_dir())
+    assert lib.missing_files == expected
+    list(lib.refresh_missing_files())
+    assert lib.missing_files == expected
+    list(lib.refresh_dir())
+    assert lib.missing_files == expected
+
+
+def test_refresh_missing_files_restarted(lib):
+    add_files(lib.root_path, 3)
+    list(lib.refresh_dir())
+    for path in list(lib.root_path.glob("*.txt")):
+        path.unlink()
+
+    first = lib.refresh_missing_files()
+    next(first)
+    list(lib.refresh_missing_files())
+    list(first)
+
+    assert len(lib.missing_files) == 3
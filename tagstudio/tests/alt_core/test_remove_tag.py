@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from src.alt_core.library import Library
+from src.database.table_declarations.entry import Entry
+from src.database.table_declarations.tag import Tag, TagAlias
+
+
+@pytest.fixture
+def lib(tmp_path: Path):
+    lib = Library()
+    assert lib.create_library(tmp_path)
+    return lib
+
+
+@pytest.fixture
+def tag_ids(lib) -> tuple[int, int]:
+    """Adds a parent Tag and a subtag with an alias, used by two Entries."""
+    with Session(lib.engine) as session, session.begin():
+        parent = Tag("Parent")
+        subtag = Tag("Subtag", parent_tags={parent}, aliases={TagAlias("Alias")})
+        entries = [Entry(path=Path(f"{i}.txt")) for i in range(2)]
+        for entry in entries:
+            entry.tags.add(subtag)
+        session.add_all([parent, subtag, *entries])
+        session.flush()
+        return parent.id, subtag.id
+
+
+def test_get_tag_ref_count(lib, tag_ids):
+    parent_id, subtag_id = tag_ids
+
+    assert lib.get_tag_ref_count(subtag_id) == (2, 1)
+    assert lib.get_tag_ref_count(parent_id) == (0, 0)
+
+
+def test_remove_tag(lib, tag_ids):
+    parent_id, subtag_id = tag_ids
+
+    lib.remove_tag(subtag_id)
+
+    assert lib.get_tag_ref_count(subtag_id) == (0, 0)
+    with Session(lib.engine) as session:
+        assert session.get(Tag, subtag_id) is None
+        assert "Alias" not in session.scalars(select(TagAlias.name)).all()
+        assert session.get(Tag, parent_id).subtags == set()
+        entries = session.scalars(select(Entry).options(selectinload(Entry.tags)))
+        assert all(entry.tags == set() for entry in entries)
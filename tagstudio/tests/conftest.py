@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+# The SQL library's modules import each other as `src.*`, `alt_core.*` and
+# `tagstudio.src.*`, so each of those roots has to be importable.
+TAGSTUDIO_DIR = Path(__file__).parents[1]
+for path in (TAGSTUDIO_DIR.parent, TAGSTUDIO_DIR, TAGSTUDIO_DIR / "src"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
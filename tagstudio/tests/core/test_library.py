@@ -0,0 +1,236 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.core.library import Entry, Library, Tag
+
+
+@pytest.fixture
+def lib() -> Library:
+    lib = Library()
+    for name, aliases in [("Cartoon", ["Toon"]), ("Character", []), ("Comic", [])]:
+        lib.add_tag_to_library(Tag(-1, name, "", aliases, [], "red"))
+    return lib
+
+
+def test_search_tags_results_are_copies(lib: Library):
+    results = lib.search_tags("c")
+    results.clear()
+
+    assert lib.search_tags("c") == [1000, 1001, 1002]
+
+
+def test_search_tags_after_add(lib: Library):
+    assert lib.search_tags("cast") == []
+
+    tag_id = lib.add_tag_to_library(Tag(-1, "Cast", "", [], [], "red"))
+
+    assert lib.search_tags("cast") == [tag_id]
+    assert lib.search_tags("") == [1000, 1001, 1002, tag_id]
+
+
+def test_search_tags_cluster_after_add(lib: Library):
+    assert lib.search_tags("cartoon", include_cluster=True) == [1000]
+
+    tag_id = lib.add_tag_to_library(Tag(-1, "Show", "", [], [1000], "red"))
+
+    assert lib.search_tags("cartoon", include_cluster=True) == [1000, tag_id]
+
+
+def test_search_tags_limit(lib: Library):
+    assert lib.search_tags("c", limit=2) == [1000, 1001]
+    assert lib.search_tags("c") == [1000, 1001, 1002]
+    assert lib.search_tags("c", limit=5) == [1000, 1001, 1002]
+
+
+def test_search_tags_after_update(lib: Library):
+    assert lib.search_tags("car") == [1000]
+
+    lib.update_tag(Tag(1000, "Animation", "", ["Toon"], [], "red"))
+
+    assert lib.search_tags("car") == []
+    assert lib.search_tags("anim") == [1000]
+
+
+def test_search_tags_in_thread_during_update(lib: Library, monkeypatch):
+    # Pause a worker thread's search between finding its results and
+    # caching them, and edit the Tag from another thread in the meantime.
+    searched = threading.Event()
+    resume = threading.Event()
+    search_tags = lib._search_tags
+
+    def paused_search_tags(*args):
+        tag_ids = search_tags(*args)
+        searched.set()
+        resume.wait(5)
+        return tag_ids
+
+    monkeypatch.setattr(lib, "_search_tags", paused_search_tags)
+    worker = threading.Thread(target=lib.search_tags, args=("car",))
+    worker.start()
+    searched.wait(5)
+    editor = threading.Thread(
+        target=lib.update_tag, args=(Tag(1000, "Animation", "", [], [], "red"),)
+    )
+    editor.start()
+    editor.join(0.1)
+    resume.set()
+    worker.join()
+    editor.join()
+    monkeypatch.undo()
+
+    assert lib.search_tags("car") == []
+
+
+def test_remove_tag(lib: Library):
+    parent_id = lib.add_tag_to_library(Tag(-1, "Show", "", [], [1000], "red"))
+    lib.add_entry_to_library(Entry(1, "a.png", "", [{6: [1000, 1001]}]))
+
+    lib.remove_tag(1000)
+
+    with pytest.raises(KeyError):
+        lib.get_tag(1000)
+    # Tags after the removed one are still found at their new indices.
+    assert [lib.get_tag(id).name for id in (1001, 1002)] == ["Character", "Comic"]
+    assert lib.get_tag(parent_id).subtag_ids == []
+    assert lib.get_tag_cluster(1000) == []
+    assert lib.search_tags("toon") == []
+    assert lib.search_tags("c") == [1001, 1002]
+    assert lib.get_entry(1).fields == [{6: [1001]}]
+
+
+@pytest.mark.parametrize("prefix", ["", "c", "ca", "car", "cartoons", "t", "z", "!"])
+def test_tag_strings_starting_with(lib: Library, prefix: str):
+    lib.add_tag_to_library(Tag(-1, "Cast", "", ["Zoo", "Cat"], [], "red"))
+    lib.remove_tag(1001)
+    lib.update_tag(Tag(1002, "Car", "", [], [], "red"))
+
+    # Strings are returned in the order they were mapped in, not sorted.
+    assert lib._tag_strings_starting_with(prefix) == [
+        string for string in lib._tag_strings_to_id_map if string.startswith(prefix)
+    ]
+
+
+def add_entries(lib: Library, files: dict[int, str]):
+    for entry_id, filename in files.items():
+        lib.add_entry_to_library(Entry(entry_id, filename, "", []))
+    lib._map_filenames_to_entry_ids()
+
+
+def test_get_entry_with_sparse_ids(lib: Library):
+    add_entries(lib, {2: "a.png", 7: "b.png", 4: "c.png"})
+
+    assert [lib.get_entry(id).filename.name for id in (2, 4, 7)] == [
+        "a.png",
+        "c.png",
+        "b.png",
+    ]
+    for missing_id in (-1, 0, 3, 8, 100):
+        with pytest.raises(KeyError):
+            lib.get_entry(missing_id)
+
+
+def test_get_entry_with_outlying_ids(lib: Library):
+    add_entries(lib, {10**9: "a.png", -1: "b.png", 10**9 + 2: "c.png", 3: "d.png"})
+
+    assert [lib.get_entry(id).filename.name for id in (10**9, -1, 10**9 + 2, 3)] == [
+        "a.png",
+        "b.png",
+        "c.png",
+        "d.png",
+    ]
+    # The array only spans the dense run of IDs; outliers live in the dict.
+    assert lib._entry_id_base == 10**9
+    assert len(lib._entry_id_to_index_map) == 3
+    assert lib._sparse_entry_id_to_index_map == {-1: 1, 3: 3}
+
+    lib.remove_entry(-1)
+
+    with pytest.raises(KeyError):
+        lib.get_entry(-1)
+    assert [lib.get_entry(id).filename.name for id in (10**9, 10**9 + 2, 3)] == [
+        "a.png",
+        "c.png",
+        "d.png",
+    ]
+
+
+def test_get_entry_with_descending_ids(lib: Library):
+    add_entries(lib, {id: f"{id}.png" for id in range(50, 0, -1)})
+
+    for id in range(1, 51):
+        assert lib.get_entry(id).filename.name == f"{id}.png"
+    with pytest.raises(KeyError):
+        lib.get_entry(0)
+    assert not lib._sparse_entry_id_to_index_map
+
+
+def test_remove_entry(lib: Library):
+    add_entries(lib, {2: "a.png", 7: "b.png", 4: "c.png"})
+
+    lib.remove_entry(2)
+
+    with pytest.raises(KeyError):
+        lib.get_entry(2)
+    assert [lib.get_entry(id).filename.name for id in (4, 7)] == ["c.png", "b.png"]
+    assert Path("a.png") not in lib.filename_to_entry_id_map
+
+
+def test_merge_dupe_entries(lib: Library):
+    add_entries(lib, {1: "a.png", 2: "b.png", 3: "a.png", 4: "c.png", 5: "a.png"})
+
+    list(lib.refresh_dupe_entries())
+    list(lib.merge_dupe_entries())
+
+    assert [e.id for e in lib.entries] == [1, 2, 4]
+    assert [lib.get_entry(id).filename.name for id in (1, 2, 4)] == [
+        "a.png",
+        "b.png",
+        "c.png",
+    ]
+    for removed_id in (3, 5):
+        with pytest.raises(KeyError):
+            lib.get_entry(removed_id)
+
+
+def test_mirror_entry_fields(lib: Library):
+    lib.add_entry_to_library(
+        Entry(1, "a.png", "", [{0: "Title"}, {6: [1000, 1001]}, {4: "Notes"}])
+    )
+    lib.add_entry_to_library(
+        Entry(
+            2,
+            "b.png",
+            "",
+            [{6: [1001, 1002]}, {0: "Title"}, {0: "Other"}, {1: "Author"}, {7: [1000]}],
+        )
+    )
+
+    lib.mirror_entry_fields([1, 2])
+
+    # Tag boxes are merged, other Fields are only dropped if their content matches.
+    merged = [
+        {0: "Title"},
+        {0: "Other"},
+        {1: "Author"},
+        {4: "Notes"},
+        {7: [1000]},
+        {6: [1000, 1001, 1002]},
+    ]
+    assert lib.get_entry(1).fields == merged
+    assert lib.get_entry(2).fields == merged
+    assert lib.get_entry(1).fields is not lib.get_entry(2).fields
+
+
+def test_refresh_dir_yields_final_count(lib: Library, tmp_path: Path):
+    lib.library_dir = tmp_path
+    (tmp_path / "sub").mkdir()
+    for i in range(3):
+        (tmp_path / "sub" / f"{i}.txt").touch()
+    (tmp_path / "a.png").touch()
+
+    counts = list(lib.refresh_dir())
+
+    assert counts[-1] == lib.dir_file_count == 4
+    assert len(lib.files_not_in_library) == 4
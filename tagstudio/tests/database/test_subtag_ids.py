@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.database.manage import make_engine, make_tables
+from src.database.table_declarations.joins import tag_subtags
+from src.database.table_declarations.tag import Tag
+
+
+@pytest.fixture
+def session():
+    engine = make_engine("sqlite://")
+    make_tables(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def tags(session: Session) -> tuple[Tag, Tag, Tag]:
+    parent, first, second = Tag("Parent"), Tag("First"), Tag("Second")
+    parent.add_subtag(first)
+    session.add_all([parent, first, second])
+    session.flush()
+    return parent, first, second
+
+
+def test_subtag_ids_are_cached(tags):
+    parent, first, _ = tags
+
+    assert parent.subtag_ids == [first.id]
+    assert parent.subtag_ids is parent.subtag_ids
+
+
+def test_subtag_ids_after_add_and_remove(tags):
+    parent, first, second = tags
+    assert parent.subtag_ids == [first.id]
+
+    parent.add_subtag(second)
+    assert sorted(parent.subtag_ids) == [first.id, second.id]
+
+    parent.remove_subtag(first)
+    assert parent.subtag_ids == [second.id]
+
+
+def test_subtag_ids_after_replace(tags):
+    parent, first, second = tags
+    assert parent.subtag_ids == [first.id]
+
+    parent.subtags = {second}
+
+    assert parent.subtag_ids == [second.id]
+
+
+def test_subtag_ids_after_refresh(session: Session, tags):
+    parent, first, second = tags
+    assert parent.subtag_ids == [first.id]
+
+    # Change the subtags without going through the ORM collection.
+    session.execute(
+        insert(tag_subtags).values(parent_tag_id=parent.id, subtag_id=second.id)
+    )
+    session.refresh(parent)
+
+    assert sorted(parent.subtag_ids) == [first.id, second.id]
+
+
+def test_subtag_ids_after_expire(session: Session, tags):
+    parent, first, second = tags
+    assert parent.subtag_ids == [first.id]
+
+    session.execute(
+        insert(tag_subtags).values(parent_tag_id=parent.id, subtag_id=second.id)
+    )
+    session.expire(parent)
+
+    assert sorted(parent.subtag_ids) == [first.id, second.id]
+
+
+def test_unflushed_subtag_ids_are_not_cached(session: Session, tags):
+    parent, first, _ = tags
+    pending = Tag("Pending")
+    parent.add_subtag(pending)
+
+    assert None in parent.subtag_ids
+    assert parent._subtag_ids is None
+
+    session.flush()
+    assert sorted(parent.subtag_ids) == [first.id, pending.id]